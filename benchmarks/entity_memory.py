@@ -0,0 +1,123 @@
+"""Measure the memory held per image entity for its own state.
+
+Run from the repository root:
+
+    python benchmarks/entity_memory.py [--entities N] [--ssids N] [--png-bytes N]
+
+Builds the per-image state of N synthetic PPSK images twice: the way images
+used to hold it (a full attribute dict plus their own QR code bytes) and with
+the shared records in records.py, where the QR code bytes live in the render
+cache instead. Private preshared keys are unique, so the render cache holds one
+QR code per image and is counted with the records for a like-for-like total.
+Only the state owned by each image is measured, not the Home Assistant entity
+machinery around it, which is the same in both layouts.
+"""
+
+from __future__ import annotations
+
+import argparse, collections, os, sys, time, tracemalloc
+
+# records.py has no Home Assistant imports, so it can be loaded on its own
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'unifi_wifi'))
+from records import ImageOptions, Interner, KeyState, SsidState  # noqa: E402
+
+
+def _password(i: int) -> str:
+    return f"correct-horse-battery-{i:06d}"
+
+
+def _qrtext(ssid: str, password: str) -> str:
+    return f"WIFI:T:WPA;S:{ssid};P:{password};;"
+
+
+def _legacy(entities: int, ssids: int, png_bytes: int) -> list:
+    """Per-image state as a full attribute dict plus the image's own QR code bytes."""
+    images = []
+    timestamp = int(time.time())
+    for i in range(entities):
+        ssid = f"ssid-{i % ssids}"
+        password = _password(i)
+        attributes = {
+            'enabled': True,
+            'hide_ssid': False,
+            'coordinator': 'myhouse',
+            'site': 'default',
+            'ssid': ssid,
+            '_id': f"wlan{i % ssids:020d}",
+            'timestamp': timestamp + i,
+            'back_color': '#ffffff',
+            'fill_color': '#000000',
+            'file_output': True,
+            'qr_quality': 'M',
+            'image_format': 'png',
+            'box_size': 16,
+            'border': 2,
+            'auth_type': 'WPA2',
+            'ppsk': True,
+            'password': password,
+            'networkconf_id': f"net{i:021d}",
+            'network_name': f"VLAN {i}",
+            'qr_text': _qrtext(ssid, password),
+        }
+        images.append((attributes, os.urandom(png_bytes)))
+    return images
+
+
+def _records(entities: int, ssids: int, png_bytes: int) -> tuple:
+    """Per-image state as shared options and SSID records plus a slotted key record.
+
+    The QR code bytes are held by an LRU keyed by render key, as in
+    qr.QrRenderCache.
+    """
+    shared = Interner()
+    cache = collections.OrderedDict()
+    images = []
+    timestamp = int(time.time())
+    for i in range(entities):
+        ssid = f"ssid-{i % ssids}"
+        password = _password(i)
+        options = shared(ImageOptions('myhouse', 'default', ssid, '#000000', '#ffffff', True, 'M', 'png', 16, 2, False))
+        state = shared(SsidState(f"wlan{i % ssids:020d}", True, False, 'WPA2'))
+        key = KeyState(f"net{i:021d}", f"VLAN {i}", password, timestamp + i)
+        key.qr_text = _qrtext(ssid, password)
+        key.render_key = f"{i:064x}"
+        if png_bytes:
+            cache[key.render_key] = os.urandom(png_bytes)
+        images.append((options, state, key))
+    return images, cache
+
+
+def _measure(build) -> int:
+    """Return the bytes still allocated after build() returns its result."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entities', type=int, default=2000, help="number of PPSK images")
+    parser.add_argument('--ssids', type=int, default=4, help="number of SSIDs the images are spread over")
+    parser.add_argument('--png-bytes', type=int, default=900, help="size of a rendered QR code")
+    args = parser.parse_args()
+
+    legacy = _measure(lambda: _legacy(args.entities, args.ssids, args.png_bytes))
+    legacy_state = _measure(lambda: _legacy(args.entities, args.ssids, 0))
+    records = _measure(lambda: _records(args.entities, args.ssids, args.png_bytes))
+    records_state = _measure(lambda: _records(args.entities, args.ssids, 0))
+
+    print(f"{args.entities} images on {args.ssids} SSIDs")
+    print(f"{'layout':<28} {'total KiB':>10} {'bytes/image':>12}")
+    print(f"{'attribute dict + bytes':<28} {legacy / 1024:>10.1f} {legacy / args.entities:>12.0f}")
+    print(f"{'attribute dict only':<28} {legacy_state / 1024:>10.1f} {legacy_state / args.entities:>12.0f}")
+    print(f"{'shared records + cache':<28} {records / 1024:>10.1f} {records / args.entities:>12.0f}")
+    print(f"{'shared records only':<28} {records_state / 1024:>10.1f} {records_state / args.entities:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Benchmark random password creation in password.py.
+
+Run from the repository root with the integration requirements installed:
+
+    python benchmarks/password_bench.py [--repeat N] [--batch N] [--output FILE]
+
+Every method is timed across the word_count, char_count and word length
+ranges allowed by PASSWORD_SCHEMA in services.py:
+
+    latency     per-call time of password.create with warm wordlists
+    batch       passwords per second of password.create_batch
+    io          time to read and index each wordlist, which happens once
+    choice      time of the random choices alone, i.e. a warm call
+
+Results are written as JSON, to stdout unless --output is given, so they can be
+compared across releases.
+"""
+
+from __future__ import annotations
+
+import argparse, json, os, platform, statistics, sys, time
+
+# password.py and const.py have no Home Assistant imports, so they can be loaded on their own
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'unifi_wifi'))
+import password as pw  # noqa: E402
+from const import CONF_METHOD_TYPES  # noqa: E402
+
+# Ranges of PASSWORD_SCHEMA in services.py
+WORD_LENGTHS = range(3, 10)
+WORD_COUNTS = range(3, 7)
+CHAR_COUNTS = range(8, 64)
+
+DEFAULTS = {
+    'punctuation': False,
+    'delimiter': '',
+    'min_length': 5,
+    'max_length': 8,
+    'word_count': 4,
+    'char_count': 24
+}
+
+WORDLISTS = {
+    'word': pw.WORD_FILE,
+    'color': pw.COLOR_FILE,
+    'noun': pw.NOUN_FILE
+}
+
+
+def _settings(method: str) -> list[dict]:
+    """Return every setting of a method allowed by PASSWORD_SCHEMA, over the defaults."""
+    if method == 'xkcd':
+        return [
+            {'min_length': lo, 'max_length': hi, 'word_count': n}
+            for n in WORD_COUNTS for lo in WORD_LENGTHS for hi in WORD_LENGTHS if lo <= hi
+        ]
+    if method == 'word':
+        return [{'word_count': n} for n in WORD_COUNTS]
+    if method == 'char':
+        return [{'char_count': n, 'punctuation': p} for n in CHAR_COUNTS for p in (False, True)]
+    return [{}]
+
+
+def _args(method: str, settings: dict) -> tuple:
+    x = {**DEFAULTS, **settings}
+    return (method, x['punctuation'], x['delimiter'], x['min_length'], x['max_length'], x['word_count'], x['char_count'])
+
+
+def _latency(args: tuple, repeat: int) -> dict:
+    """Time single password.create calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        pw.create(*args)
+        times.append(time.perf_counter_ns() - start)
+    times.sort()
+    return {
+        'mean_us': statistics.fmean(times) / 1000,
+        'p50_us': times[len(times) // 2] / 1000,
+        'p95_us': times[min(int(len(times) * 0.95), len(times) - 1)] / 1000
+    }
+
+
+def _batch(args: tuple, count: int) -> dict:
+    """Time one password.create_batch call."""
+    start = time.perf_counter()
+    pw.create_batch(count, set(), *args)
+    elapsed = time.perf_counter() - start
+    return {'count': count, 'seconds': elapsed, 'per_second': count / elapsed}
+
+
+def _io(repeat: int) -> dict:
+    """Time reading and indexing each wordlist, as a cold call does once."""
+    results = {}
+    for name, path in WORDLISTS.items():
+        times = []
+        for _ in range(repeat):
+            pw.wordlist.cache_clear()
+            start = time.perf_counter_ns()
+            index = pw.wordlist(path)
+            times.append(time.perf_counter_ns() - start)
+        results[name] = {'words': len(index), 'mean_ms': statistics.fmean(times) / 1e6, 'min_ms': min(times) / 1e6}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200, help="calls per setting for latency")
+    parser.add_argument('--batch', type=int, default=500, help="passwords per batch")
+    parser.add_argument('--io-repeat', type=int, default=20, help="loads per wordlist")
+    parser.add_argument('--output', help="write JSON to this file instead of stdout")
+    args = parser.parse_args()
+
+    io = _io(args.io_repeat)
+
+    # one cold call per method measures the first call, which also loads its wordlists
+    cold = {}
+    for method in CONF_METHOD_TYPES:
+        pw.wordlist.cache_clear()
+        start = time.perf_counter_ns()
+        pw.create(*_args(method, {}))
+        cold[method] = (time.perf_counter_ns() - start) / 1000
+
+    methods = {}
+    for method in CONF_METHOD_TYPES:
+        runs = []
+        for settings in _settings(method):
+            call = _args(method, settings)
+            try:
+                pw.create(*call)  # warm up
+            except ValueError as err:
+                # e.g. no words of the requested lengths
+                runs.append({'settings': settings, 'error': str(err)})
+                continue
+            runs.append({
+                'settings': settings,
+                'latency': _latency(call, args.repeat),
+                'batch': _batch(call, args.batch)
+            })
+        default = _latency(_args(method, {}), args.repeat)
+        methods[method] = {
+            'cold_call_us': cold[method],
+            'choice_us': default['mean_us'],
+            'runs': runs
+        }
+
+    result = {
+        'benchmark': 'password',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'batch': args.batch,
+        'defaults': DEFAULTS,
+        'io': io,
+        'methods': methods
+    }
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
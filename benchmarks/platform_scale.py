@@ -0,0 +1,225 @@
+"""Benchmark image platform setup and refreshes at synthetic scale.
+
+Run from the repository root with Home Assistant and the integration
+requirements installed:
+
+    python benchmarks/platform_scale.py [--ssids N] [--keys K] [--lazy] [--no-memory]
+
+A coordinator is fed synthetic wlanconf/networkconf payloads with N SSIDs of
+K private preshared keys each (N x K image entities) instead of talking to a
+controller. The real image platform is set up in a throwaway Home Assistant
+instance, then the following phases are timed:
+
+    setup       async_setup_platform until every entity is added
+    renders     until every QR code rendered during setup is swapped in
+    unchanged   a refresh where nothing changed
+    single      a refresh where one PPSK password changed, including its render
+    rotation    a refresh where every PPSK password changed, including renders
+
+For every phase the wall time, the memory still allocated afterwards, the
+peak memory and the number of memory blocks still allocated are reported.
+Tracing memory slows everything down; use --no-memory for clean timings.
+"""
+
+from __future__ import annotations
+
+import argparse, asyncio, json, logging, os, sys, tempfile, time, tracemalloc
+
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry,
+    category_registry,
+    device_registry,
+    entity_registry,
+    floor_registry,
+    label_registry,
+    restore_state
+)
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+
+from custom_components.unifi_wifi import CONFIG_SCHEMA, image  # noqa: E402
+from custom_components.unifi_wifi.const import DOMAIN  # noqa: E402
+from custom_components.unifi_wifi.coordinator import UnifiWifiCoordinator  # noqa: E402
+
+
+class SyntheticController:
+    """Synthetic wlanconf and networkconf payloads of N SSIDs with K PPSKs each."""
+
+    def __init__(self, ssids: int, keys: int):
+        self.ssids = ssids
+        self.keys = keys
+        # generation of every password, bumped to change it
+        self.generations = [[0] * keys for _ in range(ssids)]
+
+    def networkconf(self) -> str:
+        return json.dumps([
+            {'_id': f"net{k:021d}", 'name': f"VLAN {k}", 'purpose': 'corporate'} for k in range(self.keys)
+        ])
+
+    def wlanconf(self) -> str:
+        return json.dumps([
+            {
+                '_id': f"wlan{s:020d}",
+                'name': f"ssid-{s}",
+                'enabled': True,
+                'hide_ssid': False,
+                'security': 'wpapsk',
+                'wpa3_support': False,
+                'wpa3_transition': False,
+                'x_passphrase': f"passphrase-{s}",
+                'private_preshared_keys': [
+                    {'networkconf_id': f"net{k:021d}", 'password': f"pw-{s}-{k}-{self.generations[s][k]}"}
+                    for k in range(self.keys)
+                ]
+            }
+            for s in range(self.ssids)
+        ])
+
+
+class SyntheticCoordinator(UnifiWifiCoordinator):
+    """Coordinator reading the synthetic controller instead of a UniFi controller.
+
+    Payloads are decoded from JSON on every refresh, as responses would be.
+    """
+
+    def __init__(self, hass: HomeAssistant, config: dict, controller: SyntheticController):
+        super().__init__(hass, config)
+        self.synthetic = controller
+
+    async def _get_networkconf(self) -> list[dict]:
+        return json.loads(self.synthetic.networkconf())
+
+    async def _get_sysinfo(self) -> list[dict]:
+        return [{'version': 'synthetic'}]
+
+    async def _get_wlanconf(self) -> list[dict]:
+        return json.loads(self.synthetic.wlanconf())
+
+
+async def _settle(entities: list) -> None:
+    """Wait until no image has a pending render."""
+    while tasks := [x._render_task for x in entities if x._render_task is not None]:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _phase(name: str, results: list, memory: bool, run) -> None:
+    """Time a phase and record its memory use."""
+    if memory:
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+        results.append((name, elapsed, current - start_current, peak - start_current, blocks))
+    else:
+        results.append((name, elapsed, None, None, None))
+
+
+async def main(args: argparse.Namespace) -> None:
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for registry in (label_registry, floor_registry, area_registry, category_registry, device_registry, entity_registry):
+            await registry.async_load(hass)
+        await restore_state.async_load(hass)
+
+        config = CONFIG_SCHEMA({DOMAIN: [{
+            'name': 'bench',
+            'host': 'controller.invalid',
+            'username': 'user',
+            'password': 'pass',
+            'monitored_ssids': [
+                {'name': f"ssid-{s}", 'file_output': False, 'lazy_render': args.lazy} for s in range(args.ssids)
+            ]
+        }]})
+        hass.data[DOMAIN] = config[DOMAIN]
+
+        controller = SyntheticController(args.ssids, args.keys)
+        coordinator = SyntheticCoordinator(hass, config[DOMAIN][0], controller)
+
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(__name__),
+            domain='image',
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None
+        )
+        entities = []
+        adding = []
+
+        def _add_entities(new_entities) -> None:
+            entities.extend(new_entities)
+            adding.append(hass.async_create_task(platform.async_add_entities(new_entities)))
+
+        async def _setup() -> None:
+            await image.async_setup_platform(hass, config, _add_entities, [coordinator])
+            await asyncio.gather(*adding)
+
+        async def _renders() -> None:
+            await _settle(entities)
+
+        async def _unchanged() -> None:
+            await coordinator.async_refresh()
+            await _settle(entities)
+
+        async def _single() -> None:
+            controller.generations[0][0] += 1
+            await coordinator.async_refresh()
+            await _settle(entities)
+
+        async def _rotation() -> None:
+            for generations in controller.generations:
+                for k in range(len(generations)):
+                    generations[k] += 1
+            await coordinator.async_refresh()
+            await _settle(entities)
+
+        if args.memory:
+            tracemalloc.start()
+
+        results = []
+        for name, run in (
+            ('setup', _setup),
+            ('renders', _renders),
+            ('unchanged', _unchanged),
+            ('single', _single),
+            ('rotation', _rotation),
+        ):
+            await _phase(name, results, args.memory, run)
+
+        if args.memory:
+            tracemalloc.stop()
+
+        print(f"{args.ssids} SSIDs x {args.keys} PPSKs = {len(entities)} images{' (lazy)' if args.lazy else ''}")
+        print(f"{'phase':<10} {'ms':>10} {'net KiB':>10} {'peak KiB':>10} {'net blocks':>11}")
+        for name, elapsed, net, peak, blocks in results:
+            if net is None:
+                print(f"{name:<10} {elapsed * 1000:>10.1f}")
+            else:
+                print(f"{name:<10} {elapsed * 1000:>10.1f} {net / 1024:>10.1f} {peak / 1024:>10.1f} {blocks:>11}")
+
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ssids', type=int, default=4, help="number of SSIDs")
+    parser.add_argument('--keys', type=int, default=100, help="private preshared keys per SSID")
+    parser.add_argument('--lazy', action='store_true', help="use lazy_render for every image")
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="don't trace memory")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""Compare the qrcode PIL factory with the matrix encoder in qr.py.
+
+Run from the repository root with the integration requirements installed:
+
+    python benchmarks/qr_encoder.py [--repeat N]
+
+For each QR version and error correction level, both encoders turn the same
+module matrix into PNG bytes. The decoded pixels are checked to be identical
+before timing.
+"""
+
+from __future__ import annotations
+
+import argparse, io, os, sys, timeit
+
+import qrcode
+from PIL import Image
+
+# qr.py has no Home Assistant imports, so it can be loaded on its own
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'unifi_wifi'))
+import qr  # noqa: E402
+
+VERSIONS = [1, 2, 4, 6, 10, 15, 20, 30, 40]
+FILL = '#000000'
+BACK = '#ffffff'
+
+
+def _code(version: int, quality: str) -> qrcode.QRCode:
+    """Return a QR code of a fixed version.
+
+    The payload fits version 1 at level H; the forced version sets the size.
+    """
+    code = qrcode.QRCode(
+        version = version,
+        error_correction = qr.ERROR_CORRECTION[quality],
+        box_size = qr.BOX_SIZE,
+        border = qr.BORDER
+    )
+    code.add_data('WIFI:;;')
+    code.make(fit=False)
+    return code
+
+
+def _legacy(code: qrcode.QRCode) -> bytes:
+    """Encode with the qrcode PIL factory, as the integration used to."""
+    img = code.make_image(back_color=qr.hex_to_rgb(BACK), fill_color=qr.hex_to_rgb(FILL))
+    x = io.BytesIO()
+    img.save(x)
+    return x.getvalue()
+
+
+def _vectorized(code: qrcode.QRCode) -> bytes:
+    """Encode with the matrix encoder."""
+    return qr.encode(code.get_matrix(), FILL, BACK)
+
+
+def _pixels(data: bytes) -> bytes:
+    return Image.open(io.BytesIO(data)).convert('RGB').tobytes()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help="encodes per measurement")
+    args = parser.parse_args()
+
+    print(f"{'version':>7} {'ec':>2} {'modules':>7} {'legacy ms':>10} {'matrix ms':>10} {'speedup':>8} {'legacy B':>9} {'matrix B':>9}")
+    for version in VERSIONS:
+        for quality in qr.ERROR_CORRECTION:
+            code = _code(version, quality)
+            legacy, vectorized = _legacy(code), _vectorized(code)
+            if _pixels(legacy) != _pixels(vectorized):
+                raise SystemExit(f"pixel mismatch at version {version} level {quality}")
+
+            t_legacy = min(timeit.repeat(lambda: _legacy(code), number=args.repeat, repeat=3)) / args.repeat
+            t_vectorized = min(timeit.repeat(lambda: _vectorized(code), number=args.repeat, repeat=3)) / args.repeat
+            print(f"{version:>7} {quality:>2} {code.modules_count:>7} {t_legacy * 1000:>10.2f} {t_vectorized * 1000:>10.2f} "
+                  f"{t_legacy / t_vectorized:>7.1f}x {len(legacy):>9} {len(vectorized):>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -21,13 +21,22 @@ from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import slugify
 from .const import (
     DOMAIN,
+    CONF_ADAPTIVE_POLLING,
     CONF_BACK_COLOR,
+    CONF_BORDER,
+    CONF_BOX_SIZE,
+    CONF_EVENT_STREAM,
     CONF_FILE_OUTPUT,
     CONF_FILL_COLOR,
     CONF_FORCE_PROVISION,
+    CONF_IMAGE_FORMAT,
+    CONF_IMAGE_FORMATS,
+    CONF_LAZY_RENDER,
     CONF_MANAGED_APS,
+    CONF_MIN_ENTROPY,
     CONF_MONITORED_SSIDS,
     CONF_PRESHARED_KEYS,
+    CONF_PROVISION_CONCURRENCY,
     CONF_QR_QUALITY,
     CONF_SITE,
     CONF_SSID,
@@ -44,7 +53,15 @@ _PPSK_SCHEMA = vol.Schema({
     vol.Optional(CONF_FILL_COLOR, default='#000000'): cv.color_hex,
     vol.Optional(CONF_BACK_COLOR, default='#ffffff'): cv.color_hex,
     vol.Optional(CONF_FILE_OUTPUT, default=True): cv.boolean,
-    vol.Optional(CONF_QR_QUALITY, default='M'): vol.In(['L','M','Q','H'])
+    vol.Optional(CONF_QR_QUALITY, default='M'): vol.In(['L','M','Q','H']),
+    vol.Optional(CONF_IMAGE_FORMAT, default='png'): vol.In(CONF_IMAGE_FORMATS),
+    vol.Optional(CONF_BOX_SIZE, default=16): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=64)
+    ),
+    vol.Optional(CONF_BORDER, default=2): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=16)
+    ),
+    vol.Optional(CONF_LAZY_RENDER, default=False): cv.boolean
 })
 
 _AP_SCHEMA = vol.Schema({
@@ -60,7 +77,15 @@ _SSID_SCHEMA = vol.Schema({
     vol.Optional(CONF_FILL_COLOR, default='#000000'): cv.color_hex,
     vol.Optional(CONF_BACK_COLOR, default='#ffffff'): cv.color_hex,
     vol.Optional(CONF_FILE_OUTPUT, default=True): cv.boolean,
-    vol.Optional(CONF_QR_QUALITY, default='M'): vol.In(['L','M','Q','H'])
+    vol.Optional(CONF_QR_QUALITY, default='M'): vol.In(['L','M','Q','H']),
+    vol.Optional(CONF_IMAGE_FORMAT, default='png'): vol.In(CONF_IMAGE_FORMATS),
+    vol.Optional(CONF_BOX_SIZE, default=16): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=64)
+    ),
+    vol.Optional(CONF_BORDER, default=2): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=16)
+    ),
+    vol.Optional(CONF_LAZY_RENDER, default=False): cv.boolean
 })
 
 _SITE_SCHEMA = vol.Schema({
@@ -71,13 +96,21 @@ _SITE_SCHEMA = vol.Schema({
     vol.Optional(CONF_SITE, default='default'): cv.string,
     vol.Optional(CONF_PORT, default=443): cv.port,
     vol.Optional(CONF_SCAN_INTERVAL, default=600): cv.time_period,
+    vol.Optional(CONF_ADAPTIVE_POLLING, default=False): cv.boolean,
     vol.Optional(CONF_TIMEOUT, default=10): cv.positive_int,
     vol.Optional(CONF_UNIFI_OS, default=True): cv.boolean,
     vol.Optional(CONF_VERIFY_SSL, default=False): cv.boolean,
+    vol.Optional(CONF_EVENT_STREAM, default=False): cv.boolean,
     vol.Optional(CONF_FORCE_PROVISION, default=False): cv.boolean,
+    vol.Optional(CONF_PROVISION_CONCURRENCY, default=5): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=50)
+    ),
     vol.Optional(CONF_MANAGED_APS, default=[]): vol.All(
         cv.ensure_list, [_AP_SCHEMA]
     ),
+    vol.Optional(CONF_MIN_ENTROPY, default=0): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=256)
+    ),
     vol.Optional(CONF_MONITORED_SSIDS, default=[]): vol.All(
         cv.ensure_list, [_SSID_SCHEMA]
     ),
@@ -103,6 +136,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     coordinators = [UnifiWifiCoordinator(hass, conf) for conf in config[DOMAIN]]
     hass.data[DOMAIN] = config[DOMAIN]
 
+    # log out and close each coordinator's persistent controller session when Home Assistant stops
+    for coordinator in coordinators:
+        await coordinator.async_register_shutdown()
+        coordinator.async_start_event_stream()
+
     hass.async_create_task(async_load_platform(hass, 'image', DOMAIN, coordinators, config))
 
     await register_services(hass, coordinators)
@@ -2,34 +2,53 @@
 
 DOMAIN = 'unifi_wifi'
 
+CONF_ADAPTIVE_POLLING = 'adaptive_polling'
 CONF_AUTH_TYPE = 'auth_type'
 CONF_BACK_COLOR = 'back_color'
+CONF_BORDER = 'border'
+CONF_BOX_SIZE = 'box_size'
 CONF_CHAR_COUNT = 'char_count'
+CONF_COLUMNS = 'columns'
 CONF_COORDINATOR = 'coordinator'
 CONF_DATA = 'data'
 CONF_DELIMITER = 'delimiter'
+CONF_ENDPOINT_ERRORS = 'endpoint_errors'
+CONF_ENTROPY = 'entropy'
+CONF_EVENT_STREAM = 'event_stream'
 CONF_FILE_OUTPUT = 'file_output'
 CONF_FILL_COLOR = 'fill_color'
 CONF_FORCE_PROVISION = 'force_provision'
+CONF_FORMAT = 'format'
 CONF_HIDE_SSID = 'hide_ssid'
+CONF_IMAGE_FORMAT = 'image_format'
+CONF_IMAGE_FORMATS = ['png','svg']
+CONF_LAZY_RENDER = 'lazy_render'
 CONF_MANAGED_APS = 'managed_aps'
 CONF_MANAGER = 'manager'
 CONF_MAX_LENGTH = 'max_length'
 CONF_METHOD_TYPES = ['xkcd','word','char','rainbow']
+CONF_MIN_ENTROPY = 'min_entropy'
 CONF_MIN_LENGTH = 'min_length'
 CONF_MONITORED_SSIDS = 'monitored_ssids'
 CONF_NETWORK_NAME = 'network_name'
+CONF_PAGE_SIZE = 'page_size'
 CONF_PPSK = 'ppsk'
 CONF_PRESHARED_KEYS = 'preshared_keys'
+CONF_PROVISION_CONCURRENCY = 'provision_concurrency'
 CONF_PUNCTUATION = 'punctuation'
 CONF_QR_QUALITY = 'qr_quality'
 CONF_QR_TEXT = 'qr_text'
 CONF_RANDOM = 'random'
+CONF_RESULTS = 'results'
+CONF_ROWS = 'rows'
+CONF_SHOW_PASSWORD = 'show_password'
 CONF_SITE = 'site'
 CONF_SSID = 'ssid'
 CONF_TIMESTAMP = 'timestamp'
 CONF_UNIFI_OS = 'unifi_os'
+CONF_UPDATE_INTERVAL = 'update_interval'
 CONF_WORD_COUNT = 'word_count'
+CONF_WORDLIST = 'wordlist'
 
 # Some of the below values are duplicates of CONF or homeassistant.const values
 # This is done to allow for changes in UniFi API keys
@@ -40,6 +59,7 @@ UNIFI_MANAGERS = ['evtmgt','sitemgr','stamgr','devmgr','backup','system','stat']
 UNIFI_NAME = 'name' # duplicate (const)
 UNIFI_NETWORKCONF_ID = 'networkconf_id'
 UNIFI_CSRF_TOKEN = 'X-CSRF-Token'
+UNIFI_EVENT_WLANCONF = ['wlanconf:add','wlanconf:sync','wlanconf:delete']
 UNIFI_SECURITY = 'security'
 UNIFI_X_PASSPHRASE = 'x_passphrase'
 UNIFI_X_PASSWORD = 'x_password'
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import logging, aiohttp, asyncio
+import logging, aiohttp, asyncio, math, random, time
+
+from datetime import datetime, timedelta
 
 from homeassistant.const import (
+    CONF_ENABLED,
     CONF_HOST,
     CONF_MAC,
     CONF_NAME,
@@ -17,23 +20,54 @@ from homeassistant.const import (
 )
 from homeassistant.core import callback, HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, IntegrationError
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed
 )
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_EVENT_STREAM,
     CONF_FORCE_PROVISION,
     CONF_MANAGED_APS,
+    CONF_MIN_ENTROPY,
+    CONF_PROVISION_CONCURRENCY,
     CONF_SITE,
     CONF_UNIFI_OS,
     UNIFI_CSRF_TOKEN,
+    UNIFI_EVENT_WLANCONF,
+    UNIFI_HIDE_SSID,
     UNIFI_ID,
-    UNIFI_NAME
+    UNIFI_NAME,
+    UNIFI_NETWORKCONF_ID,
+    UNIFI_PASSWORD,
+    UNIFI_PRESHARED_KEYS,
+    UNIFI_SECURITY,
+    UNIFI_WPA3_SUPPORT,
+    UNIFI_WPA3_TRANSITION,
+    UNIFI_X_PASSPHRASE
 )
+from .events import UnifiEventStream
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds to wait for further WLAN change events before reloading wlanconf
+EVENT_RELOAD_COOLDOWN = 2
+
+# Adaptive polling: poll every ADAPTIVE_FAST_INTERVAL seconds for ADAPTIVE_FAST_WINDOW seconds
+# after a write or a change, then back off up to ADAPTIVE_MAX_FACTOR times scan_interval
+ADAPTIVE_FAST_INTERVAL = 30
+ADAPTIVE_FAST_WINDOW = 300
+ADAPTIVE_MAX_FACTOR = 4
+
+# Fraction of each poll interval added or removed at random
+POLL_JITTER = 0.1
+
+# Seconds to wait after a write before re-reading the controller to verify the local state
+VERIFY_REFRESH_DELAY = 30
+
 # Useful for verbose debugging of http requests
 # WARNING: This will expose usernames and passwords
 EXTRA_DEBUG = False
@@ -58,9 +92,22 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
             update_interval=config[CONF_SCAN_INTERVAL],
         )
 
+        self._fingerprints_cache = {}
+        self._changed_contexts = set()
+        self._last_dispatch_success = True
         self.networkconf = []
         self.sysinfo = []
         self.wlanconf = []
+        self.endpoint_errors = {}
+        self._scan_interval = config[CONF_SCAN_INTERVAL]
+        self._adaptive = config[CONF_ADAPTIVE_POLLING]
+        self._fast_until = 0
+        # multiple of scan_interval of the next stable poll, doubled up to ADAPTIVE_MAX_FACTOR
+        self._backoff = 1
+        # the interval before jitter
+        self._interval = self._scan_interval.total_seconds()
+        # the polling interval and endpoint errors images last showed
+        self._dispatched_status = None
         self.name = config[CONF_NAME]
         self.verify_ssl = config[CONF_VERIFY_SSL]
         self.site = config[CONF_SITE]
@@ -70,8 +117,17 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
         self._password = config[CONF_PASSWORD]
         self._force = config[CONF_FORCE_PROVISION]
         self._aps = config[CONF_MANAGED_APS]
+        self.min_entropy = config[CONF_MIN_ENTROPY]
+        # (SSID name, networkconf_id or None) --> (password, entropy bits) of random passwords set by the services
+        self.entropy = {}
+        self._provision_concurrency = config[CONF_PROVISION_CONCURRENCY]
+        self.last_provision = {}
         self._timeout = config[CONF_TIMEOUT]
         self._unifi_os = config[CONF_UNIFI_OS]
+        self._session = None
+        self._headers = None
+        self._login_lock = asyncio.Lock()
+        self._unsub_verify_refresh = None
         if self._unifi_os:
             self._login_prefix = '/api/auth'
             self._api_prefix = '/proxy/network'
@@ -79,11 +135,115 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
             self._login_prefix = '/api'
             self._api_prefix = ''
 
+        self._event_stream = None
+        if config[CONF_EVENT_STREAM]:
+            self._event_stream = UnifiEventStream(
+                self.name,
+                f"wss://{self._base_url}:{self._port}{self._api_prefix}/wss/s/{self.site}/events",
+                self._get_session,
+                self._login,
+                self._handle_event,
+                self._handle_event_connect
+            )
+            self._event_reload = Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=EVENT_RELOAD_COOLDOWN,
+                immediate=False,
+                function=self._reload_wlanconf
+            )
+
+    @property
+    def networkconf(self) -> list[dict]:
+        """networkconf data from the controller."""
+        return self._networkconf
+
+    @networkconf.setter
+    def networkconf(self, value: list[dict]) -> None:
+        """Set networkconf and rebuild its lookup tables."""
+        self._networkconf = value
+        # networkconf _id --> network and network name --> network
+        self.networks = {network[UNIFI_ID]: network for network in value}
+        self.network_names = {}
+        for network in value:
+            self.network_names.setdefault(network[UNIFI_NAME], network)
+
+    @property
+    def wlanconf(self) -> list[dict]:
+        """wlanconf data from the controller."""
+        return self._wlanconf
+
+    @wlanconf.setter
+    def wlanconf(self, value: list[dict]) -> None:
+        """Set wlanconf and rebuild its lookup tables."""
+        self._wlanconf = value
+        # SSID name --> wlan and SSID name --> {networkconf_id --> private preshared key}
+        # Only the first key of each network is used, which matches how image entities are created
+        self.ssids = {}
+        self.ppsks = {}
+        for wlan in value:
+            self.ssids.setdefault(wlan[UNIFI_NAME], wlan)
+            keys = {}
+            for key in wlan.get(UNIFI_PRESHARED_KEYS, []):
+                keys.setdefault(key[UNIFI_NETWORKCONF_ID], key)
+            self.ppsks.setdefault(wlan[UNIFI_NAME], keys)
+
+        # Remember which images are affected so only their listeners are updated,
+        # including those whose SSID or private preshared key was removed
+        fingerprints = self._fingerprints()
+        for context, fingerprint in fingerprints.items():
+            if self._fingerprints_cache.get(context) != fingerprint:
+                self._changed_contexts.add(context)
+        self._changed_contexts.update(self._fingerprints_cache.keys() - fingerprints.keys())
+        self._fingerprints_cache = fingerprints
+
+    def _fingerprints(self) -> dict[tuple, int]:
+        """Fingerprint the wlanconf fields that drive each image.
+
+        Keys are (SSID name, networkconf_id) for private preshared keys and (SSID name, None) for the SSID itself.
+        """
+        fingerprints = {}
+        for ssid, wlan in self.ssids.items():
+            base = (
+                wlan.get(CONF_ENABLED),
+                wlan.get(UNIFI_HIDE_SSID),
+                wlan.get(UNIFI_SECURITY),
+                wlan.get(UNIFI_WPA3_SUPPORT),
+                wlan.get(UNIFI_WPA3_TRANSITION)
+            )
+            fingerprints[(ssid, None)] = hash(base + (wlan.get(UNIFI_X_PASSPHRASE),))
+            for network_id, key in self.ppsks[ssid].items():
+                fingerprints[(ssid, network_id)] = hash(base + (key.get(UNIFI_PASSWORD),))
+        return fingerprints
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of images whose fingerprint changed.
+
+        Listeners without a context are always updated, and every listener is updated when the update
+        success state, or the polling interval or endpoint errors shown by the images change.
+        """
+        changed, self._changed_contexts = self._changed_contexts, set()
+
+        status = (self.effective_interval, self.endpoint_errors)
+        if self.last_update_success != self._last_dispatch_success or status != self._dispatched_status:
+            self._last_dispatch_success = self.last_update_success
+            self._dispatched_status = status
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
     async def _async_update_data(self) -> None:
         """Fetch the latest data from a UniFi controller."""
+        # every image is new to the first successful refresh, which is not a change to poll for
+        first = not self._fingerprints_cache
         try:
-            async with asyncio.timeout(self._timeout):
-                return await self._update_info()
+            # each endpoint has its own timeout, see _update_info
+            await self._update_info()
+            self.update_interval = self._next_interval(bool(self._changed_contexts) and not first)
         # Note: asyncio.TimeoutError and aiohttp.ClientError are already
         # handled by the data update coordinator.
         except ApiAuthError as err:
@@ -93,11 +253,69 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
         except ApiError as err:
             raise UpdateFailed(f"Error communicating with API: {err}", retry_after=60) from err
 
-    async def _request(self, session: aiohttp.ClientSession, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
-        """Make a request."""
+    @property
+    def effective_interval(self) -> int:
+        """Seconds between polls as last chosen by the scheduler, before jitter."""
+        return round(self._interval)
+
+    @property
+    def controller(self) -> str:
+        """host:port of the controller, which may be shared by several coordinators (sites)."""
+        return f"{self._base_url}:{self._port}"
+
+    def write_timeout(self, count: int) -> float:
+        """Seconds that set_wlanconfs() may take to write count SSIDs.
+
+        Every request gets the configured timeout: reading wlanconf, writing each SSID, and
+        listing and force provisioning the access points in waves of provision_concurrency.
+        """
+        waves = math.ceil(len(self._aps) / self._provision_concurrency) if self._aps else 1
+        return self._timeout * (count + 2 + waves)
+
+    def _next_interval(self, changed: bool) -> timedelta:
+        """Choose the interval until the next poll.
+
+        With adaptive polling, poll tightly for a while after a write or an observed change,
+        then back off exponentially while the configuration stays stable. Every interval is
+        jittered so coordinators (e.g. several sites on the same controller) drift apart.
+        """
+        now = time.monotonic()
+        if changed:
+            self._fast_until = now + ADAPTIVE_FAST_WINDOW
+
+        base = self._scan_interval.total_seconds()
+        if not self._adaptive:
+            seconds = base
+        elif now < self._fast_until:
+            seconds = min(ADAPTIVE_FAST_INTERVAL, base)
+            self._backoff = 1
+        else:
+            seconds = base * self._backoff
+            self._backoff = min(self._backoff * 2, ADAPTIVE_MAX_FACTOR)
+
+        self._interval = seconds
+        seconds *= random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+        _LOGGER.debug("_next_interval Next poll for %s in %.0f seconds", self.name, seconds)
+        return timedelta(seconds=seconds)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the persistent session for this coordinator, creating it if necessary."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                # https://docs.aiohttp.org/en/stable/client_advanced.html#ssl-control-for-tcp-sockets
+                connector=aiohttp.TCPConnector(ssl=False),
+                # without unsafe=True the login response cookie must be explicitly passed in each request
+                # https://docs.aiohttp.org/en/stable/client_advanced.html#cookie-safety
+                #cookie_jar=aiohttp.CookieJar(unsafe=True)
+            )
+            self._headers = None
+        return self._session
+
+    async def _send(self, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
+        """Make a request on the persistent session."""
 
         fullpath = f"https://{self._base_url}:{self._port}{path}"
-        response = await session.request(method, fullpath, **kwargs)
+        response = await self._get_session().request(method, fullpath, **kwargs)
 
         _LOGGER.debug("_request method %s on path %s (status %s)", method, fullpath, response.status)
 
@@ -109,49 +327,136 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
 
         status = response.status
         if status == 401 or status == 403:
-            raise ApiAuthError(f"{await response.json()}")
+            raise ApiAuthError(f"{await response.text()}")
         elif status == 429 or status >= 500:
-            raise ApiError(f"{await response.json()}")
+            raise ApiError(f"{await response.text()}")
         elif not response.ok: # catch all other non 2xx status codes
+            response.release()
             response.raise_for_status()
         else:
-            pass
+            # read the body now so the connection is returned to the keep-alive pool
+            await response.read()
 
         return response
 
-    async def _login(self, session: aiohttp.ClientSession) -> list[dict]:
-        """log into a UniFi controller."""
-        # Create headers for all requests to use with the current session
-        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+    async def _request(self, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
+        """Make an authenticated request.
+
+        The cached login is reused until the controller answers with a 401 or 403,
+        in which case the coordinator logs in again and retries the request once.
+        """
+        headers = await self._login()
+        try:
+            return await self._send(method, path, headers=headers, **kwargs)
+        except ApiAuthError:
+            _LOGGER.debug("_request login for %s has expired, logging in again", self.name)
+            headers = await self._login(expired=headers)
+            return await self._send(method, path, headers=headers, **kwargs)
+
+    async def _login(self, expired: dict | None = None) -> dict:
+        """log into a UniFi controller.
 
-        payload = {'username': self._username, 'password': self._password}
-        kwargs = {'json': payload, 'headers': headers}
-        path = f"{self._login_prefix}/login"
-        response = await self._request(session, 'post', path, **kwargs)
+        Returns the cached headers unless there are none yet or they are the expired ones.
+        """
+        async with self._login_lock:
+            if self._headers is not None and self._headers is not expired:
+                return self._headers
 
-        # Create a cookie from the current session response and add it to the headers
-        headers['Cookie'] = '; '.join(response.headers.getall('Set-Cookie'))
-        if self._unifi_os:
-            headers[UNIFI_CSRF_TOKEN] = response.headers.get(UNIFI_CSRF_TOKEN)
+            # Create headers for all requests to use with the current session
+            headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
 
-        return headers
+            payload = {'username': self._username, 'password': self._password}
+            kwargs = {'json': payload, 'headers': headers}
+            path = f"{self._login_prefix}/login"
+            response = await self._send('post', path, **kwargs)
 
-    async def _logout(self, session: aiohttp.ClientSession, headers: list[dict]):
+            # Create a cookie from the current session response and add it to the headers
+            headers['Cookie'] = '; '.join(response.headers.getall('Set-Cookie'))
+            if self._unifi_os:
+                headers[UNIFI_CSRF_TOKEN] = response.headers.get(UNIFI_CSRF_TOKEN)
+
+            self._headers = headers
+            return headers
+
+    async def _logout(self):
         """log out of a UniFi controller."""
-        headers['Content-Length'] = '0'
+        if self._headers is None:
+            return
+        headers = {**self._headers, 'Content-Length': '0'}
+        self._headers = None
         kwargs = {'headers': headers}
         path = f"{self._login_prefix}/logout"
-        await self._request(session, 'post', path, **kwargs)
+        await self._send('post', path, **kwargs)
+
+    @callback
+    def async_start_event_stream(self) -> None:
+        """Start listening to the controller's site events, if enabled."""
+        if self._event_stream is not None:
+            self._event_stream.start(
+                lambda coro: self.hass.async_create_background_task(coro, f"{self.name} event stream")
+            )
+
+    @callback
+    def _handle_event(self, message: str, data: list) -> None:
+        """Reload wlanconf when the controller reports a WLAN configuration change."""
+        if message in UNIFI_EVENT_WLANCONF:
+            _LOGGER.debug("_handle_event %s received from %s", message, self.name)
+            self._event_reload.async_schedule_call()
+
+    @callback
+    def _handle_event_connect(self) -> None:
+        """Reload wlanconf once the event stream is connected, to pick up changes made while it was not."""
+        self._event_reload.async_schedule_call()
+
+    async def _reload_wlanconf(self) -> None:
+        """Reload only wlanconf and update any affected images."""
+        try:
+            async with asyncio.timeout(self._timeout):
+                self.wlanconf = await self._get_wlanconf()
+        except (aiohttp.ClientError, IntegrationError, TimeoutError) as err:
+            _LOGGER.warning("_reload_wlanconf Unable to reload wlanconf for %s: %s", self.name, err)
+            return
 
-    async def _force_provision(self, session: aiohttp.ClientSession, headers: list[dict]):
-        """Force provision any access points adopted by a UniFi controller."""
-        kwargs = {'headers': headers}
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Log out of the controller and close the persistent session."""
+        await super().async_shutdown()
+
+        if self._event_stream is not None:
+            self._event_reload.async_shutdown()
+            await self._event_stream.stop()
+
+        if self._unsub_verify_refresh is not None:
+            self._unsub_verify_refresh()
+            self._unsub_verify_refresh = None
+
+        if self._session is None or self._session.closed:
+            return
+
+        try:
+            async with asyncio.timeout(self._timeout):
+                await self._logout()
+        except (aiohttp.ClientError, IntegrationError, TimeoutError) as err:
+            _LOGGER.debug("async_shutdown unable to log out of %s: %s", self.name, err)
+        finally:
+            await self._session.close()
+            self._session = None
+
+    async def _force_provision(self) -> dict:
+        """Force provision any access points adopted by a UniFi controller.
+
+        Access points are provisioned concurrently, bounded by provision_concurrency.
+        Returns a summary of the provision wave including its duration and any per access point errors.
+        """
+        # a wave that fails before provisioning anything leaves no summary
+        self.last_provision = {}
 
         aps = []
         if self._aps == []: # no access points listed in YAML config
             # GET info on adopted access points from controller
             path = f"{self._api_prefix}/api/s/{self.site}/stat/device-basic"
-            response = await self._request(session, 'get', path, **kwargs)
+            response = await self._request('get', path)
 
             json = await response.json()
 
@@ -163,43 +468,65 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
             aps = self._aps
 
         path = f"{self._api_prefix}/api/s/{self.site}/cmd/devmgr"
-        for ap in aps:
-            payload = {'cmd': 'force-provision', 'mac': ap[CONF_MAC]}
-            kwargs['json'] = payload
-            await self._request(session, 'post', path, **kwargs)
+        semaphore = asyncio.Semaphore(self._provision_concurrency)
+
+        async def _provision(ap: dict):
+            async with semaphore:
+                payload = {'cmd': 'force-provision', 'mac': ap[CONF_MAC]}
+                await self._request('post', path, json=payload)
+
+        start = time.monotonic()
+        results = await asyncio.gather(*[_provision(ap) for ap in aps], return_exceptions=True)
+        duration = time.monotonic() - start
+
+        errors = {}
+        for ap, result in zip(aps, results):
+            if isinstance(result, Exception):
+                errors[ap[CONF_MAC]] = str(result)
+                _LOGGER.warning("_force_provision Unable to provision %s (%s) on %s: %s", ap.get(CONF_NAME), ap[CONF_MAC], self.name, result)
 
-    async def _get_networkconf(self, session: aiohttp.ClientSession, headers: list[dict]):
+        _LOGGER.info("Force provisioned %i of %i access points on %s in %.2f seconds (concurrency %i)",
+            len(aps) - len(errors), len(aps), self.name, duration, self._provision_concurrency)
+
+        self.last_provision = {
+            'access_points': len(aps),
+            'errors': errors,
+            'duration': round(duration, 3)
+        }
+
+        if aps and len(errors) == len(aps):
+            raise ApiError(f"Unable to provision any access points on {self.name}: {errors}")
+
+        return self.last_provision
+
+    async def _get_networkconf(self) -> list[dict]:
         """Get networkconf info from a UniFi controller."""
-        kwargs = {'headers': headers}
         path = f"{self._api_prefix}/api/s/{self.site}/rest/networkconf"
-        response = await self._request(session, 'get', path, **kwargs)
+        response = await self._request('get', path)
 
         conf = await response.json()
-        self.networkconf = conf['data']
+        return conf['data']
 
-    async def _get_sysinfo(self, session: aiohttp.ClientSession, headers: list[dict]):
+    async def _get_sysinfo(self) -> list[dict]:
         """Get system info from a UniFi controller."""
-        kwargs = {'headers': headers}
         path = f"{self._api_prefix}/api/s/{self.site}/stat/sysinfo"
-        response = await self._request(session, 'get', path, **kwargs)
+        response = await self._request('get', path)
 
         conf = await response.json()
-        self.sysinfo = conf['data']
+        return conf['data']
 
-    async def _get_wlanconf(self, session: aiohttp.ClientSession, headers: list[dict]):
+    async def _get_wlanconf(self) -> list[dict]:
         """Get wlanconf info from a UniFi controller."""
-        kwargs = {'headers': headers}
         path = f"{self._api_prefix}/api/s/{self.site}/rest/wlanconf"
-        response = await self._request(session, 'get', path, **kwargs)
+        response = await self._request('get', path)
 
         conf = await response.json()
-        self.wlanconf = conf['data']
+        return conf['data']
 
-    async def _get_restsetting(self, session: aiohttp.ClientSession, headers: list[dict]) -> list[dict]:
+    async def _get_restsetting(self) -> list[dict]:
         """Get rest setting info from a UniFi controller."""
-        kwargs = {'headers': headers}
         path = f"{self._api_prefix}/api/s/{self.site}/rest/setting"
-        response = await self._request(session, 'get', path, **kwargs)
+        response = await self._request('get', path)
 
         conf = await response.json()
 
@@ -212,100 +539,144 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
 
         It is called by the coordinator to keep itself and its entities updated.
         """
-        async with aiohttp.ClientSession(
-            # https://docs.aiohttp.org/en/stable/client_advanced.html#ssl-control-for-tcp-sockets
-            connector=aiohttp.TCPConnector(ssl=False),
-            # without unsafe=True the login response cookie must be explicitly passed in each request
-            # https://docs.aiohttp.org/en/stable/client_advanced.html#cookie-safety
-            #cookie_jar=aiohttp.CookieJar(unsafe=True)
-        ) as session:
-            _LOGGER.debug("_update_info Updating info for %s", self.name)
-
-            headers = await self._login(session)
-
-            await self._get_sysinfo(session, headers)
-            await self._get_networkconf(session, headers)
-            await self._get_wlanconf(session, headers)
-            await self._logout(session, headers)
-
-            del headers # not sure if this is necessary
-            return await session.close()
-
-    async def set_wlanconf(self, ssid: str, payload: str, force: bool = False) -> bool:
-        """Update a wireless network setting."""
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False)
-        ) as session:
-            _LOGGER.debug("set_wlanconf Setting new conf value for %s for %s", ssid, self.name)
-
-            headers = await self._login(session)
-
-            # Find the unifi identification number for a specific SSID
-            await self._get_wlanconf(session, headers)
-            idssid = [wlan[UNIFI_NAME] for wlan in self.wlanconf].index(ssid)
-            idno = self.wlanconf[idssid][UNIFI_ID]
-
-            kwargs = {'headers': headers, 'json': payload}
-            path = f"{self._api_prefix}/api/s/{self.site}/rest/wlanconf/{idno}"
-            response = await self._request(session, 'put', path, **kwargs)
-
-            if self._force or force:
-                await self._force_provision(session, headers)
-
-            await self._logout(session, headers)
+        _LOGGER.debug("_update_info Updating info for %s", self.name)
+
+        # The endpoints are independent, so request them concurrently on the shared session.
+        # Each has its own timeout, so a slow endpoint doesn't discard the others.
+        endpoints = ['sysinfo', 'networkconf', 'wlanconf']
+        results = await asyncio.gather(
+            asyncio.wait_for(self._get_sysinfo(), self._timeout),
+            asyncio.wait_for(self._get_networkconf(), self._timeout),
+            asyncio.wait_for(self._get_wlanconf(), self._timeout),
+            return_exceptions=True
+        )
 
-            del headers
-            await session.close()
+        data = {}
+        errors = {}
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, Exception):
+                errors[endpoint] = result
+                _LOGGER.warning("_update_info Unable to fetch %s for %s: %r", endpoint, self.name, result)
+            else:
+                data[endpoint] = result
+
+        self.endpoint_errors = {endpoint: str(err) or type(err).__name__ for endpoint, err in errors.items()}
+
+        # An expired or rejected login affects every endpoint, and there is nothing to apply
+        # when every endpoint failed. Otherwise keep the previous data for any failed endpoint.
+        for err in errors.values():
+            if isinstance(err, ApiAuthError):
+                raise err
+        if not data:
+            raise errors[endpoints[0]]
+
+        # Apply the results together (without awaiting in between) so listeners never see a mix
+        self.sysinfo = data.get('sysinfo', self.sysinfo)
+        self.networkconf = data.get('networkconf', self.networkconf)
+        self.wlanconf = data.get('wlanconf', self.wlanconf)
+
+    async def set_wlanconfs(self, payloads: dict[str, dict], force: bool = False) -> tuple[dict[str, Exception], dict | None]:
+        """Update the settings of several wireless networks at once.
+
+        wlanconf is read once, each SSID payload is written and merged into the cached wlanconf,
+        and then access points are provisioned at most once for the whole batch. Listeners are
+        notified immediately and a single verify refresh is scheduled.
+        Returns a dictionary of SSID names and the error raised while writing each one (empty on success),
+        and the summary of the provision wave, or None if access points were not provisioned. A failed
+        provision wave is reported in its summary, since the SSIDs were written regardless.
+        """
+        _LOGGER.debug("set_wlanconfs Setting new conf values for %s for %s", list(payloads), self.name)
+
+        # Find the unifi identification numbers for the requested SSIDs
+        self.wlanconf = await self._get_wlanconf()
+        ids = {ssid: wlan[UNIFI_ID] for ssid, wlan in self.ssids.items()}
+        missing = [ssid for ssid in payloads if ssid not in ids]
+        if missing:
+            raise IntegrationError(f"SSID(s) {missing} not found on coordinator {self.name}")
+
+        errors = {}
+        for ssid, payload in payloads.items():
+            path = f"{self._api_prefix}/api/s/{self.site}/rest/wlanconf/{ids[ssid]}"
+            try:
+                response = await self._request('put', path, json=payload)
+            except (aiohttp.ClientError, IntegrationError) as err:
+                _LOGGER.warning("set_wlanconfs Unable to update SSID %s on %s: %s", ssid, self.name, err)
+                errors[ssid] = err
+                continue
+
+            # The controller responds with the updated wlanconf object. Merge it into the cached
+            # wlanconf; fall back to the sent payload if the response does not include it.
+            conf = await response.json()
+            if conf.get('data'):
+                self._merge_wlanconf(conf['data'][0])
+            else:
+                self._merge_wlanconf({UNIFI_ID: ids[ssid], **payload})
+
+        provision = None
+        if len(errors) < len(payloads):
+            # Let entities pick up the new state right away, and confirm it with the controller later
+            self.async_update_listeners()
+            self._schedule_verify_refresh()
 
-            return await self.async_request_refresh()
+            if self._force or force:
+                try:
+                    provision = {**await self._force_provision(), 'error': None}
+                except (aiohttp.ClientError, TimeoutError, IntegrationError) as err:
+                    _LOGGER.warning("set_wlanconfs Unable to provision access points on %s: %s", self.name, err)
+                    provision = {**self.last_provision, 'error': str(err)}
+
+        return errors, provision
+
+    def _merge_wlanconf(self, entry: dict) -> None:
+        """Replace (or update) a cached wlanconf entry with a newer copy of the same _id."""
+        wlanconf = []
+        for wlan in self.wlanconf:
+            if wlan[UNIFI_ID] == entry[UNIFI_ID]:
+                wlan = {**wlan, **entry}
+            wlanconf.append(wlan)
+        self.wlanconf = wlanconf
+
+    @callback
+    def _schedule_verify_refresh(self) -> None:
+        """Refresh from the controller a while after a write to verify the locally updated state."""
+        # a write starts a window of tighter polling (see _next_interval)
+        self._fast_until = time.monotonic() + ADAPTIVE_FAST_WINDOW
+        if self._unsub_verify_refresh is not None:
+            self._unsub_verify_refresh()
+        self._unsub_verify_refresh = async_call_later(self.hass, VERIFY_REFRESH_DELAY, self._handle_verify_refresh)
+
+    async def _handle_verify_refresh(self, _now: datetime) -> None:
+        """Run the delayed verify refresh."""
+        self._unsub_verify_refresh = None
+        await self.async_request_refresh()
 
     async def set_restsetting(self, key: str, payload: str, force: bool = False) -> bool:
         """Update a site setting."""
         # BE CAREFUL! This function is currently intended only to update hotspot credentials.
         # However, it is able to change many site settings when provided an existing key/payload combination
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False)
-        ) as session:
-            _LOGGER.debug("set_restsetting Setting new key (%s) value for %s", key, self.name)
-
-            headers = await self._login(session)
-
-            # download current site settings and read the _id value of the intended key
-            data = await self._get_restsetting(session, headers)
-            idkey = [d['key'] for d in data].index(key)
-            idno = data[idkey][UNIFI_ID]
-
-            kwargs = {'headers': headers, 'json': payload}
-            path = f"{self._api_prefix}/api/s/{self.site}/rest/setting/{key}/{idno}"
-            await self._request(session, 'put', path, **kwargs)
+        _LOGGER.debug("set_restsetting Setting new key (%s) value for %s", key, self.name)
 
-            if self._force or force:
-                await self._force_provision(session, headers)
+        # download current site settings and read the _id value of the intended key
+        data = await self._get_restsetting()
+        idno = {d['key']: d[UNIFI_ID] for d in data}[key]
 
-            await self._logout(session, headers)
+        path = f"{self._api_prefix}/api/s/{self.site}/rest/setting/{key}/{idno}"
+        await self._request('put', path, json=payload)
 
-            del headers
-            await session.close()
+        if self._force or force:
+            await self._force_provision()
 
-            return await self.async_request_refresh()
+        # site settings are not cached, so there is nothing to merge locally
+        self._schedule_verify_refresh()
+        return True
 
     async def send_command(self, manager: str, json: str) -> bool:
         """Send a command to the site."""
         # This function is currently intended for development purposes only
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False)
-        ) as session:
-            _LOGGER.debug("send_cmd sending (%s) command to (%s)", json, manager)
-
-            headers = await self._login(session)
-
-            path = f"{self._api_prefix}/api/s/{self.site}/cmd/{manager}"
-            kwargs = {'headers': headers, 'json': json}
-            response = await self._request(session, 'post', path, **kwargs)
-
-            await self._logout(session, headers)
+        _LOGGER.debug("send_cmd sending (%s) command to (%s)", json, manager)
 
-            del headers
-            await session.close()
+        path = f"{self._api_prefix}/api/s/{self.site}/cmd/{manager}"
+        response = await self._request('post', path, json=json)
 
-            return await self.async_request_refresh()
\ No newline at end of file
+        self._schedule_verify_refresh()
+        return True
@@ -0,0 +1,43 @@
+"""Entropy of random passwords."""
+
+from __future__ import annotations
+
+import functools, math, string
+
+from . import password as pw
+
+
+@functools.lru_cache(maxsize=256)
+def bits(_method: str, _punctuation: bool, _min_length: int, _max_length: int, _word_count: int, _char_count: int, _words: pw.WordIndex | None = None) -> float:
+    """Return the entropy in bits of a random password created with these settings.
+
+    Every symbol of a password is chosen uniformly at random, so its entropy is
+    the sum of log2 of the number of choices for each symbol. Delimiters are
+    fixed and add nothing. _words replaces the EFF wordlist of the word and xkcd
+    methods. Wordlists are loaded on the first call, so call this from the
+    executor.
+    """
+    if _method == 'xkcd':
+        choices = len((_words or pw.wordlist(pw.WORD_FILE)).select(_min_length, _max_length))
+        x = _word_count * math.log2(choices) if choices else 0.0
+
+    elif _method == 'word':
+        x = _word_count * math.log2(len(_words or pw.wordlist(pw.WORD_FILE)))
+
+    elif _method == 'char':
+        alphabet = string.ascii_letters + string.digits
+        if _punctuation:
+            alphabet += string.punctuation
+        x = _char_count * math.log2(len(alphabet))
+
+    elif _method == 'rainbow':
+        x = (
+            math.log2(len(pw.wordlist(pw.COLOR_FILE)))
+            + math.log2(len(pw.wordlist(pw.NOUN_FILE)))
+            + pw.RAINBOW_SALT * math.log2(len(string.digits))
+        )
+
+    else:
+        raise ValueError(f"Method {_method} is not a valid option.")
+
+    return round(x, 1)
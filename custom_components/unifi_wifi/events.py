@@ -0,0 +1,124 @@
+"""Unifi Wifi controller event stream."""
+
+from __future__ import annotations
+
+import logging, aiohttp, asyncio, json
+
+from collections.abc import Awaitable, Callable
+
+from homeassistant.exceptions import IntegrationError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between reconnect attempts; doubled after every failed attempt up to the maximum
+RECONNECT_MIN = 5
+RECONNECT_MAX = 300
+
+# Seconds between websocket pings used to detect a dead connection
+HEARTBEAT = 30
+
+# Useful for verbose debugging of websocket messages
+# WARNING: This may expose passwords
+EXTRA_DEBUG = False
+
+
+class UnifiEventStream:
+    """Representation of a UniFi controller site event websocket.
+
+    The stream is independent of the coordinator so it can be pointed at any
+    websocket server (e.g. a local stand-in server when testing).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        get_session: Callable[[], aiohttp.ClientSession],
+        login: Callable[[dict | None], Awaitable[dict]],
+        on_message: Callable[[str, list], None],
+        on_connect: Callable[[], None]
+    ):
+        """Initialize the event stream.
+
+        get_session returns the session to connect with, login(expired) returns the
+        request headers (logging in again when given the expired ones),
+        on_message(message, data) is called for every message received, and
+        on_connect() every time the websocket is (re)connected, since messages sent
+        while it was not connected are missed.
+        """
+        self.name = name
+        self.url = url
+        self._get_session = get_session
+        self._login = login
+        self._on_message = on_message
+        self._on_connect = on_connect
+        self._task = None
+
+    def start(self, create_task: Callable[[Awaitable], asyncio.Task]) -> None:
+        """Start listening in a task created by create_task."""
+        if self._task is None or self._task.done():
+            self._task = create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the websocket."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Keep a websocket connection open, reconnecting with exponential backoff."""
+        delay = RECONNECT_MIN
+        headers = None
+        while True:
+            try:
+                headers = await self._login(None)
+                await self._listen(headers)
+                delay = RECONNECT_MIN
+            except aiohttp.WSServerHandshakeError as err:
+                if err.status in (401, 403):
+                    # The cached login has expired, so log in again before reconnecting
+                    _LOGGER.debug("%s event stream login has expired, logging in again", self.name)
+                    try:
+                        await self._login(headers)
+                    except (aiohttp.ClientError, IntegrationError, TimeoutError) as login_err:
+                        _LOGGER.warning("%s event stream unable to log in: %s", self.name, login_err)
+                else:
+                    _LOGGER.warning("%s event stream handshake failed: %s", self.name, err)
+            except (aiohttp.ClientError, IntegrationError, TimeoutError) as err:
+                _LOGGER.warning("%s event stream disconnected: %s", self.name, err)
+
+            _LOGGER.debug("%s event stream reconnecting in %i seconds", self.name, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    async def _listen(self, headers: dict) -> None:
+        """Connect once and handle messages until the websocket closes."""
+        async with self._get_session().ws_connect(self.url, headers=headers, heartbeat=HEARTBEAT, ssl=False) as ws:
+            _LOGGER.debug("%s event stream connected to %s", self.name, self.url)
+            self._on_connect()
+
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    self._handle(msg.data)
+                elif msg.type == aiohttp.WSMsgType.ERROR:
+                    raise aiohttp.ClientError(f"websocket error: {ws.exception()}")
+
+        _LOGGER.debug("%s event stream closed by %s", self.name, self.url)
+
+    def _handle(self, text: str) -> None:
+        """Decode a message and pass it on."""
+        if EXTRA_DEBUG: _LOGGER.debug("%s event stream message: %s", self.name, text)
+
+        try:
+            msg = json.loads(text)
+            message = msg['meta']['message']
+        except (ValueError, KeyError, TypeError):
+            _LOGGER.debug("%s event stream ignoring unexpected message", self.name)
+            return
+
+        self._on_message(message, msg.get('data', []))
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-import logging, collections, qrcode, io, re
+import logging, asyncio, collections, re
+
+from datetime import datetime
 
 from homeassistant.components.image import ImageEntity
 from homeassistant.const import (
@@ -12,11 +14,11 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import callback, HomeAssistant
 from homeassistant.exceptions import IntegrationError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.httpx_client import get_async_client
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.dt import parse_datetime, utcnow
@@ -25,10 +27,16 @@ from .const import (
     DOMAIN,
     CONF_AUTH_TYPE,
     CONF_BACK_COLOR,
+    CONF_BORDER,
+    CONF_BOX_SIZE,
     CONF_COORDINATOR,
+    CONF_ENDPOINT_ERRORS,
+    CONF_ENTROPY,
     CONF_FILE_OUTPUT,
     CONF_FILL_COLOR,
     CONF_HIDE_SSID,
+    CONF_IMAGE_FORMAT,
+    CONF_LAZY_RENDER,
     CONF_MONITORED_SSIDS,
     CONF_NETWORK_NAME,
     CONF_PPSK,
@@ -38,6 +46,7 @@ from .const import (
     CONF_SITE,
     CONF_SSID,
     CONF_TIMESTAMP,
+    CONF_UPDATE_INTERVAL,
     UNIFI_HIDE_SSID,
     UNIFI_ID,
     UNIFI_NAME,
@@ -45,14 +54,19 @@ from .const import (
     UNIFI_SECURITY,
     UNIFI_X_PASSPHRASE,
     UNIFI_PASSWORD,
-    UNIFI_PRESHARED_KEYS,
     UNIFI_WPA3_SUPPORT,
     UNIFI_WPA3_TRANSITION
 )
 from .coordinator import UnifiWifiCoordinator
+from .output import QrFileWriter
+from .records import ImageOptions, Interner, KeyState, SsidState
+from . import qr
 
 EXTRA_DEBUG = False
 
+# Equal options and SSID states are shared by every image instead of copied
+_SHARED = Interner()
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -65,146 +79,216 @@ async def async_setup_platform(
 ) -> None:
     """Set up the Unifi Wifi image platform."""
 
-    entities = []
+    # Rendered QR codes are shared by every image and survive restarts
+    cache = qr.QrRenderCache(hass.config.path(STORAGE_DIR, f"{DOMAIN}_qr"))
+    await hass.async_add_executor_job(cache.load)
+    writer = QrFileWriter(hass)
 
-    for idconf, conf in enumerate(hass.data[DOMAIN]):
-        x = coordinators[idconf]
+    async def _setup_coordinator(conf: ConfigType, x: UnifiWifiCoordinator) -> None:
+        """Refresh one coordinator and add its images as soon as it responds."""
         await x.async_refresh()
-        for wlan in conf[CONF_MONITORED_SSIDS]:
-
-            # check if preshared keys are configured for the current SSID
-            keys = []
-            for y in x.wlanconf:
-                if y[UNIFI_NAME] == wlan[CONF_NAME]:
-                    try:
-                        keys = y[UNIFI_PRESHARED_KEYS]
-                    except:
-                        break
-
-            if keys:
-                if wlan[CONF_PRESHARED_KEYS]: # create image entities for SPECIFIC private pre-shared keys
-                    for ppsk in wlan[CONF_PRESHARED_KEYS]:
-                        try:
-                            # find network_id in networkconf
-                            idpresharedkey = [network[UNIFI_NAME] for network in x.networkconf].index(ppsk[CONF_NAME])
-                            network_id = x.networkconf[idpresharedkey][UNIFI_ID]
-                            if EXTRA_DEBUG: _LOGGER.debug("ppsk %s found at index %i with id %s in networkconf on coordinator %s", ppsk[CONF_NAME], idpresharedkey, network_id, conf[CONF_NAME])
-
-                            # find [network_id, password] dictionary in private pre-shared keys
-                            idkey = [k[UNIFI_NETWORKCONF_ID] for k in keys].index(network_id)
-                            key = keys[idkey]
-                            if EXTRA_DEBUG: _LOGGER.debug("ppsk %s found with entry %s in wlanconf on coordinator %s", ppsk[CONF_NAME], key, conf[CONF_NAME])
-
-                            image = UnifiWifiImage(hass, x, wlan[CONF_NAME], ppsk[CONF_FILL_COLOR], ppsk[CONF_BACK_COLOR], ppsk[CONF_FILE_OUTPUT], ppsk[CONF_QR_QUALITY], key = key)
-                            entities.append(image)
-                            i = [network[UNIFI_ID] for network in x.networkconf].index(key[UNIFI_NETWORKCONF_ID])
-                            _LOGGER.debug("Setting up image for SSID (ppsk) %s (%s) on coordinator %s", wlan[CONF_NAME], x.networkconf[i][UNIFI_NAME], conf[CONF_NAME])
-                        except ValueError as err:
-                            raise IntegrationError(f"ppsk {ppsk[CONF_NAME]} not found under SSID {wlan[CONF_NAME]} on coordinator {x.name}: {err}")
-                else: # create image entities for ALL private pre-shared keys
-                    for key in keys:
-                        image = UnifiWifiImage(hass, x, wlan[CONF_NAME], wlan[CONF_FILL_COLOR], wlan[CONF_BACK_COLOR], wlan[CONF_FILE_OUTPUT], wlan[CONF_QR_QUALITY], key = key)
-                        entities.append(image)
-                        i = [network[UNIFI_ID] for network in x.networkconf].index(key[UNIFI_NETWORKCONF_ID])
-                        _LOGGER.debug("Setting up image for SSID (ppsk) %s (%s) on coordinator %s", wlan[CONF_NAME], x.networkconf[i][UNIFI_NAME], conf[CONF_NAME])
-            else:
-                image = UnifiWifiImage(hass, x, wlan[CONF_NAME], wlan[CONF_FILL_COLOR], wlan[CONF_BACK_COLOR], wlan[CONF_FILE_OUTPUT], wlan[CONF_QR_QUALITY])
-                entities.append(image)
-                _LOGGER.debug("Setting up image for SSID %s on coordinator %s", wlan[CONF_NAME], conf[CONF_NAME])
 
-    async_add_entities(entities)
+        if x.last_update_success:
+            _add_entities(conf, x)
+            return
+
+        # Don't hold up the other coordinators. Keep polling this one, and
+        # set up its images after the first successful update.
+        _LOGGER.warning("Coordinator %s is unreachable; its images will be set up once it responds", x.name)
+
+        @callback
+        def _delayed_setup() -> None:
+            if x.last_update_success:
+                remove_listener()
+                _add_entities(conf, x)
+
+        remove_listener = x.async_add_listener(_delayed_setup)
+
+    @callback
+    def _add_entities(conf: ConfigType, x: UnifiWifiCoordinator) -> None:
+        """Create and add the images of one coordinator."""
+        try:
+            entities = _create_entities(hass, conf, x, cache, writer)
+        except IntegrationError as err:
+            _LOGGER.error("Unable to set up images for coordinator %s: %s", x.name, err)
+            return
+        # private preshared keys are unique, so every image may need its own render
+        cache.reserve(len(entities))
+        async_add_entities(entities)
+
+    await asyncio.gather(*[
+        _setup_coordinator(conf, coordinators[idconf]) for idconf, conf in enumerate(hass.data[DOMAIN])
+    ])
+    hass.async_add_executor_job(cache.prune)
+
+
+def _create_entities(hass: HomeAssistant, conf: ConfigType, x: UnifiWifiCoordinator, cache: qr.QrRenderCache, writer: QrFileWriter) -> list[UnifiWifiImage]:
+    """Create the image entities of one coordinator from its refreshed data."""
+
+    def _options(ssid: str, image_conf: ConfigType) -> ImageOptions:
+        return _SHARED(ImageOptions(
+            x.name,
+            x.site,
+            ssid,
+            image_conf[CONF_FILL_COLOR],
+            image_conf[CONF_BACK_COLOR],
+            image_conf[CONF_FILE_OUTPUT],
+            image_conf[CONF_QR_QUALITY],
+            image_conf[CONF_IMAGE_FORMAT],
+            image_conf[CONF_BOX_SIZE],
+            image_conf[CONF_BORDER],
+            image_conf[CONF_LAZY_RENDER]
+        ))
+
+    entities = []
+
+    for wlan in conf[CONF_MONITORED_SSIDS]:
+
+        # check if preshared keys are configured for the current SSID
+        keys = x.ppsks.get(wlan[CONF_NAME], {})
+
+        if keys:
+            if wlan[CONF_PRESHARED_KEYS]: # create image entities for SPECIFIC private pre-shared keys
+                for ppsk in wlan[CONF_PRESHARED_KEYS]:
+                    # find network_id in networkconf
+                    network = x.network_names.get(ppsk[CONF_NAME])
+                    if network is None:
+                        raise IntegrationError(f"ppsk {ppsk[CONF_NAME]} not found under SSID {wlan[CONF_NAME]} on coordinator {x.name}: network not found in networkconf")
+                    network_id = network[UNIFI_ID]
+                    if EXTRA_DEBUG: _LOGGER.debug("ppsk %s found with id %s in networkconf on coordinator %s", ppsk[CONF_NAME], network_id, conf[CONF_NAME])
+
+                    # find [network_id, password] dictionary in private pre-shared keys
+                    key = keys.get(network_id)
+                    if key is None:
+                        raise IntegrationError(f"ppsk {ppsk[CONF_NAME]} not found under SSID {wlan[CONF_NAME]} on coordinator {x.name}: no private pre-shared key for network {network_id}")
+                    if EXTRA_DEBUG: _LOGGER.debug("ppsk %s found with entry %s in wlanconf on coordinator %s", ppsk[CONF_NAME], key, conf[CONF_NAME])
+
+                    image = UnifiWifiImage(hass, x, _options(wlan[CONF_NAME], ppsk), cache, writer, key = key)
+                    entities.append(image)
+                    _LOGGER.debug("Setting up image for SSID (ppsk) %s (%s) on coordinator %s", wlan[CONF_NAME], ppsk[CONF_NAME], conf[CONF_NAME])
+            else: # create image entities for ALL private pre-shared keys (one per network)
+                options = _options(wlan[CONF_NAME], wlan)
+                for network_id, key in keys.items():
+                    image = UnifiWifiImage(hass, x, options, cache, writer, key = key)
+                    entities.append(image)
+                    _LOGGER.debug("Setting up image for SSID (ppsk) %s (%s) on coordinator %s", wlan[CONF_NAME], x.networks.get(network_id, {}).get(UNIFI_NAME), conf[CONF_NAME])
+        else:
+            image = UnifiWifiImage(hass, x, _options(wlan[CONF_NAME], wlan), cache, writer)
+            entities.append(image)
+            _LOGGER.debug("Setting up image for SSID %s on coordinator %s", wlan[CONF_NAME], conf[CONF_NAME])
+
+    return entities
 
 
 class UnifiWifiImage(CoordinatorEntity, ImageEntity, RestoreEntity):
-    """Representation of a Unifi Wifi image."""
+    """Representation of a Unifi Wifi image.
+
+    Configuration and SSID level state are shared with the other images of the
+    SSID, and the QR code itself is kept in the render cache; only the network
+    and password are held per image.
+    """
 
-    def __init__(self, hass: HomeAssistant, coordinator: UnifiWifiCoordinator, ssid: str, fill_color: str, back_color: str, output: bool, quality: str, key: dict = {}):
+    def __init__(self, hass: HomeAssistant, coordinator: UnifiWifiCoordinator, options: ImageOptions, cache: qr.QrRenderCache, writer: QrFileWriter, key: dict = {}):
         """Initialize the image."""
-        super().__init__(coordinator)
+        # The context matches the coordinator fingerprint key, so the image is only updated when its data changes
+        super().__init__(coordinator, (options.ssid, key.get(UNIFI_NETWORKCONF_ID)))
         self.hass = hass
+        self._cache = cache
+        self._writer = writer
+        self._options = options
 
-        idssid = self._ssid_index(ssid)
+        ssid = options.ssid
+        wlan = self._ssid_conf(ssid)
+        self._ssid_state = self._wlan_state(wlan)
 
         dt = utcnow()
 
-        attributes = {
-            CONF_ENABLED: self.coordinator.wlanconf[idssid][CONF_ENABLED],
-            CONF_HIDE_SSID: self.coordinator.wlanconf[idssid][UNIFI_HIDE_SSID],
-            CONF_COORDINATOR: self.coordinator.name,
-            CONF_SITE: self.coordinator.site,
-            CONF_SSID: ssid,
-            UNIFI_ID: self.coordinator.wlanconf[idssid][UNIFI_ID],
-            CONF_TIMESTAMP: int(dt.timestamp()),
-            CONF_BACK_COLOR: back_color,
-            CONF_FILL_COLOR: fill_color,
-            CONF_FILE_OUTPUT: output,
-            CONF_QR_QUALITY: quality
-        }
-
-        if self.coordinator.wlanconf[idssid][UNIFI_SECURITY] == 'open':
-            attributes[CONF_AUTH_TYPE] = 'OPEN'
-            attributes[CONF_PPSK] = False
-            attributes[CONF_PASSWORD] = 'nopass'
-            self._attr_name = f"{attributes[CONF_COORDINATOR]} {ssid} wifi"
+        if self._ssid_state.auth_type != 'OPEN' and bool(key):
+            network_id = key[UNIFI_NETWORKCONF_ID]
+            try:
+                network_name = self.coordinator.networks[network_id][UNIFI_NAME]
+            except KeyError as err:
+                raise IntegrationError(f"Network {network_id} not found on coordinator {self.coordinator.name}: {err}")
+            self._key = KeyState(network_id, network_name, key[UNIFI_PASSWORD], int(dt.timestamp()))
+            self._attr_name = f"{options.coordinator} {ssid} {network_name} wifi"
         else:
-            wpa3_support = self.coordinator.wlanconf[idssid][UNIFI_WPA3_SUPPORT]
-            wpa3_transition = self.coordinator.wlanconf[idssid][UNIFI_WPA3_TRANSITION]
-            if wpa3_support and not wpa3_transition:
-                auth_type = 'WPA3'
-            elif wpa3_support and wpa3_transition:
-                auth_type = 'WPA2/WPA3'
-            else:
-                auth_type = 'WPA2'
-            attributes[CONF_AUTH_TYPE] = auth_type
-
-            if bool(key):
-                attributes[CONF_PPSK] = True
-                attributes[CONF_PASSWORD] = key[UNIFI_PASSWORD]
-                attributes[UNIFI_NETWORKCONF_ID] = key[UNIFI_NETWORKCONF_ID]
-                idnetwork = [x[UNIFI_ID] for x in self.coordinator.networkconf].index(attributes[UNIFI_NETWORKCONF_ID])
-                attributes[CONF_NETWORK_NAME] = self.coordinator.networkconf[idnetwork][UNIFI_NAME]
-                self._attr_name = f"{attributes[CONF_COORDINATOR]} {ssid} {attributes[CONF_NETWORK_NAME]} wifi"
-            else:
-                attributes[CONF_PPSK] = False
-                attributes[CONF_PASSWORD] = self.coordinator.wlanconf[idssid][UNIFI_X_PASSPHRASE]
-                self._attr_name = f"{attributes[CONF_COORDINATOR]} {ssid} wifi"
+            password = 'nopass' if self._ssid_state.auth_type == 'OPEN' else wlan[UNIFI_X_PASSPHRASE]
+            self._key = KeyState(None, None, password, int(dt.timestamp()))
+            self._attr_name = f"{options.coordinator} {ssid} wifi"
 
         if EXTRA_DEBUG:
-            _LOGGER.debug("wlanconf for image.%s: [%s]", slugify(self._attr_name), self.coordinator.wlanconf[idssid])
-
-        # Set entity attributes AFTER all values have been determined
-        # Any changes afterwards will not be updated until an entity update is triggered
-        self._attributes = attributes
+            _LOGGER.debug("wlanconf for image.%s: [%s]", slugify(self._attr_name), wlan)
 
         self._attr_unique_id = slugify(f"{DOMAIN}_{self._attr_name}_image")
-        self._attr_content_type: str = "image/png"
+        self._attr_content_type: str = qr.CONTENT_TYPES[options.image_format]
         self._attr_image_last_updated = dt
 
+        self._render_task = None
         self._create_qr()
 
-        verify_ssl = self.coordinator.verify_ssl
-        if verify_ssl:
-            self._attr_image_url = f"https://127.0.0.1:8123/local/{slugify(self._attr_name)}_qr.png"
+        if self.coordinator.verify_ssl:
+            self._attr_image_url = f"https://127.0.0.1:8123/local/{slugify(self._attr_name)}_qr.{options.image_format}"
         else:
-            self._attr_image_url = f"http://127.0.0.1:8123/local/{slugify(self._attr_name)}_qr.png"
+            self._attr_image_url = f"http://127.0.0.1:8123/local/{slugify(self._attr_name)}_qr.{options.image_format}"
 
-        self._client = get_async_client(hass, verify_ssl=verify_ssl)
         self.access_tokens: collections.deque = collections.deque([], 2)
         self.async_update_token()
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        return self._attributes
+        options, state, key = self._options, self._ssid_state, self._key
+        attributes = {
+            CONF_ENABLED: state.enabled,
+            CONF_HIDE_SSID: state.hide_ssid,
+            CONF_COORDINATOR: options.coordinator,
+            CONF_SITE: options.site,
+            CONF_SSID: options.ssid,
+            UNIFI_ID: state.wlan_id,
+            CONF_TIMESTAMP: key.timestamp,
+            CONF_BACK_COLOR: options.back_color,
+            CONF_FILL_COLOR: options.fill_color,
+            CONF_FILE_OUTPUT: options.file_output,
+            CONF_QR_QUALITY: options.qr_quality,
+            CONF_IMAGE_FORMAT: options.image_format,
+            CONF_BOX_SIZE: options.box_size,
+            CONF_BORDER: options.border,
+            CONF_AUTH_TYPE: state.auth_type,
+            CONF_PPSK: key.network_id is not None,
+            CONF_PASSWORD: key.password,
+            CONF_ENTROPY: self._entropy()
+        }
+        if key.network_id is not None:
+            attributes[UNIFI_NETWORKCONF_ID] = key.network_id
+            attributes[CONF_NETWORK_NAME] = key.network_name
+        attributes[CONF_QR_TEXT] = key.qr_text
+        attributes[CONF_UPDATE_INTERVAL] = self.coordinator.effective_interval
+        attributes[CONF_ENDPOINT_ERRORS] = self.coordinator.endpoint_errors
+        return attributes
 
     @property
     def name(self):
         """Name of the entity."""
         return self._attr_name
 
+    @property
+    def available(self) -> bool:
+        """Return if the controller responds and still has the SSID (and private preshared key) of this image."""
+        return super().available and self._exists()
+
+    def _exists(self) -> bool:
+        """Return if the SSID (and private preshared key) of this image is in the coordinator data."""
+        if self._key.network_id is not None:
+            return self._key.network_id in self.coordinator.ppsks.get(self._options.ssid, {})
+        return self._options.ssid in self.coordinator.ssids
+
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._update_data()
+        # an image whose SSID or private preshared key was removed keeps its last data and becomes unavailable
+        if self._exists():
+            self._update_data()
+        # also written when only the availability or the update_interval attribute changed
+        self.async_write_ha_state()
 
     async def async_update(self) -> None:
         """Update the entity.
@@ -218,7 +302,32 @@ class UnifiWifiImage(CoordinatorEntity, ImageEntity, RestoreEntity):
         
         Needed for frontend cache to refresh correctly.
         """
-        return self._code_bytes
+        while True:
+            # the previous QR code is served until a pending render is swapped in
+            if (render_key := self._key.render_key) is not None and (code := self._cache.get(render_key)) is not None:
+                return code
+
+            if self._render_task is None:
+                # lazily rendered, or evicted from the render cache: render on request
+                render = self._render_args()
+                self._render_task = self.hass.async_create_background_task(
+                    self._async_render(qr.render_key(*render), render, None),
+                    f"{DOMAIN} render {self._attr_name}"
+                )
+
+            task = self._render_task
+            try:
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                # wait for the render that superseded this one
+                if not task.cancelled():
+                    raise
+
+    async def async_will_remove_from_hass(self) -> None:
+        """When entity will be removed from hass."""
+        self._cancel_render()
+        self._writer.discard(self._file_path())
+        await super().async_will_remove_from_hass()
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
@@ -242,109 +351,170 @@ class UnifiWifiImage(CoordinatorEntity, ImageEntity, RestoreEntity):
 
             # Sometimes on reboots, and otherwise, the image entity is (re-)added to HASS
             # If these attributes are not restored, then a timestamp update may be triggered
-            for attr in [
-                CONF_PASSWORD,
-                CONF_TIMESTAMP,
-                CONF_AUTH_TYPE
-            ]:
-                if attr in last_state.attributes:
-                    self._attributes[attr] = last_state.attributes[attr]
-                    if EXTRA_DEBUG: _LOGGER.debug("Restored attribute %s (%s)", attr, last_state.attributes[attr])
+            attributes = last_state.attributes
+            if CONF_PASSWORD in attributes:
+                self._key.password = attributes[CONF_PASSWORD]
+                if attributes.get(CONF_ENTROPY) is not None:
+                    self.coordinator.entropy.setdefault(
+                        (self._options.ssid, self._key.network_id), (attributes[CONF_PASSWORD], attributes[CONF_ENTROPY])
+                    )
+            if CONF_TIMESTAMP in attributes:
+                self._key.timestamp = attributes[CONF_TIMESTAMP]
+            if CONF_AUTH_TYPE in attributes:
+                self._ssid_state = _SHARED(self._ssid_state._replace(auth_type=attributes[CONF_AUTH_TYPE]))
+            if EXTRA_DEBUG: _LOGGER.debug("Restored attributes %s", {attr: attributes.get(attr) for attr in (CONF_PASSWORD, CONF_ENTROPY, CONF_TIMESTAMP, CONF_AUTH_TYPE)})
 
             _LOGGER.debug("Restored: %s", self._attr_name)
+
+            # the QR code was created from coordinator data before the restore, and the
+            # coordinator already cached its fingerprint so this entity is not woken for it.
+            # The state is written once the entity is added.
+            if self._exists():
+                self._update_data()
         else:
             _LOGGER.debug("Unable to restore: %s", self._attr_name)
 
-    def _hex_to_rgb(self, value: str):
-        """return an RGB tuple of a hex color."""
-        # https://stackoverflow.com/questions/29643352/converting-hex-to-rgb-value-in-python
-        value = value.lstrip('#')
-        return tuple(int(value[i:i+2], 16) for i in (0, 2, 4))
+    def _entropy(self) -> float | None:
+        """Return the entropy in bits of the password, if it was randomly created by a service."""
+        password, bits = self.coordinator.entropy.get((self._options.ssid, self._key.network_id), (None, None))
+        return bits if password == self._key.password else None
+
+    def _create_qr(self, dt: datetime | None = None) -> None:
+        """Create a QR code and save it as a PNG.
 
-    def _create_qr(self) -> None:
-        """Create a QR code and save it as a PNG."""
+        dt is the image_last_updated to set once the new QR code is served.
+        """
 
         qrtext = 'WIFI:' # Start QR generation string
 
-        escaped_ssid = re.sub(r'([\\ \; \, \" \:])', r'\\\1', self._attributes[CONF_SSID])
+        escaped_ssid = re.sub(r'([\\ \; \, \" \:])', r'\\\1', self._options.ssid)
 
-        auth_type = self._attributes[CONF_AUTH_TYPE]
+        auth_type = self._ssid_state.auth_type
         if auth_type == 'OPEN':
             qrtext += f"T:nopass;S:{escaped_ssid};"
         else: # WPA2, WPA2/WPA3, or WPA3
             qrtext += f"T:WPA;S:{escaped_ssid};"
             if auth_type == 'WPA3':
                 qrtext += 'R:1;' # add the WPA2/WPA3 transition mode disable flag
-            escaped_pass = re.sub(r'([\\ \; \, \" \:])', r'\\\1', self._attributes[CONF_PASSWORD])
+            escaped_pass = re.sub(r'([\\ \; \, \" \:])', r'\\\1', self._key.password)
             qrtext += f"P:{escaped_pass};"
 
-        if self._attributes[CONF_HIDE_SSID]:
+        if self._ssid_state.hide_ssid:
             qrtext += 'H:true;'
 
         qrtext += ';' # End QR generation string
-        self._attributes[CONF_QR_TEXT] = qrtext
-
-        match self._attributes[CONF_QR_QUALITY]:
-            case 'L':
-                ec = qrcode.constants.ERROR_CORRECT_L
-            case 'M':
-                ec = qrcode.constants.ERROR_CORRECT_M
-            case 'Q':
-                ec = qrcode.constants.ERROR_CORRECT_Q
-            case 'H':
-                ec = qrcode.constants.ERROR_CORRECT_H
-
-        qr = qrcode.QRCode(
-            version = 1,
-            error_correction = ec,
-            box_size = 16,
-            border = 2
+        self._key.qr_text = qrtext
+
+        render = self._render_args()
+
+        # identical QR codes are only rendered once, even across restarts
+        key = qr.render_key(*render)
+        code = self._cache.get(key)
+        if code is not None:
+            if EXTRA_DEBUG: _LOGGER.debug("QR code for image.%s found in render cache", slugify(self._attr_name))
+            self._cancel_render()
+            self._swap_qr(key, code, dt)
+            return
+
+        if self._options.lazy_render:
+            # Only mark the image dirty; async_image() renders it when it is requested.
+            # The frontend is told to reload right away since no render is pending.
+            self._cancel_render()
+            self._key.render_key = key
+            if dt is not None:
+                self._attr_image_last_updated = dt
+            if self._options.file_output:
+                self._writer.defer(self._file_path(), self.async_image)
+            return
+
+        # Rendering is CPU bound, so it runs in the executor. The previous
+        # QR code keeps being served until the new one is ready.
+        self._cancel_render()
+        self._render_task = self.hass.async_create_background_task(
+            self._async_render(key, render, dt),
+            f"{DOMAIN} render {self._attr_name}"
         )
-        qr.add_data(qrtext)
-        qr.make(fit=True)
-        img = qr.make_image(
-            back_color=self._hex_to_rgb(self._attributes[CONF_BACK_COLOR]),
-            fill_color=self._hex_to_rgb(self._attributes[CONF_FILL_COLOR])
+
+    def _render_args(self) -> tuple:
+        """Return the arguments of qr.render() for the current QR code text."""
+        options = self._options
+        return (
+            self._key.qr_text,
+            options.fill_color,
+            options.back_color,
+            options.qr_quality,
+            options.box_size,
+            options.border,
+            options.image_format
         )
 
+    async def _async_render(self, key: str, render: tuple, dt: datetime | None) -> None:
+        """Render a QR code in the executor and swap it in.
+
+        A render that was evicted from the LRU, or not loaded at startup, is
+        read back from disk instead of being rendered again.
+        """
+        try:
+            code = await self.hass.async_add_executor_job(self._cache.read, key)
+            if code is None:
+                code = await self.hass.async_add_executor_job(qr.render, *render)
+                self.hass.async_add_executor_job(self._cache.save, key, code)
+        finally:
+            # a failed render is tried again on the next request, unless it was already superseded
+            if self._render_task is asyncio.current_task():
+                self._render_task = None
+        self._cache.put(key, code)
+        self._swap_qr(key, code, dt)
+
+        if dt is not None and self.entity_id is not None:
+            self.async_write_ha_state()
+
+    @callback
+    def _swap_qr(self, key: str, code: bytes, dt: datetime | None) -> None:
+        """Start serving a new QR code."""
+        # the frontend bytes are looked up in the render cache by key
+        self._key.render_key = key
+
+        # only tell the frontend to reload the image once the new bytes are in place
+        if dt is not None:
+            self._attr_image_last_updated = dt
+
         # generate QR code file
-        output = self._attributes[CONF_FILE_OUTPUT]
-        if output:
-            path = f"/config/www/{slugify(self._attr_name)}_qr.png"
-            self.hass.async_add_executor_job(img.save, path)
-
-        # generate QR code byte string needed for the frontend
-        x = io.BytesIO()
-        img.save(x)
-        self._code_bytes = x.getvalue()
-
-    def _ssid_index(self, ssid: str) -> int:
-        """Find the array index of a specific ssid in wlanconf."""
+        if self._options.file_output:
+            self._writer.queue(self._file_path(), code)
+
+    def _file_path(self) -> str:
+        """Return the path of the QR code file in the www directory."""
+        return f"/config/www/{slugify(self._attr_name)}_qr.{self._options.image_format}"
+
+    @callback
+    def _cancel_render(self) -> None:
+        """Cancel a pending render that has been superseded."""
+        if self._render_task is not None:
+            self._render_task.cancel()
+            self._render_task = None
+
+    def _ssid_conf(self, ssid: str) -> dict:
+        """Find the wlanconf entry of a specific ssid."""
         try:
-            return [x[UNIFI_NAME] for x in self.coordinator.wlanconf].index(ssid)
-        except ValueError as err:
+            return self.coordinator.ssids[ssid]
+        except KeyError as err:
             raise IntegrationError(f"SSID {ssid} not found on coordinator {self.coordinator.name}: {err}")
 
-    def _network_index(self, network_id: str) -> int:
-        """Find the array index of a specific network in wlanconf."""
+    def _ppsk_conf(self, network_id: str) -> dict:
+        """Find the private preshared key entry of a specific network in wlanconf."""
         try:
-            idssid = self._ssid_index(self._attributes[CONF_SSID])
-            return [x[UNIFI_NETWORKCONF_ID] for x in self.coordinator.wlanconf[idssid][UNIFI_PRESHARED_KEYS]].index(network_id)
-        except ValueError as err:
+            return self.coordinator.ppsks[self._options.ssid][network_id]
+        except KeyError as err:
             raise IntegrationError(f"Network {network_id} not found on coordinator {self.coordinator.name}: {err}")
 
-    def _update_data(self) -> None:
-        """Update state and attributes when changes are detected."""
-        idssid = self._ssid_index(self._attributes[CONF_SSID])
-        enabled_state = self.coordinator.wlanconf[idssid][CONF_ENABLED]
-        hide_state = self.coordinator.wlanconf[idssid][UNIFI_HIDE_SSID]
-
-        if self.coordinator.wlanconf[idssid][UNIFI_SECURITY] == 'open':
+    def _wlan_state(self, wlan: dict) -> SsidState:
+        """Return the shared SSID level state of a wlanconf entry."""
+        if wlan[UNIFI_SECURITY] == 'open':
             auth_type = 'OPEN'
-            new_password = 'nopass'
         else:
-            wpa3_support = self.coordinator.wlanconf[idssid][UNIFI_WPA3_SUPPORT]
-            wpa3_transition = self.coordinator.wlanconf[idssid][UNIFI_WPA3_TRANSITION]
+            wpa3_support = wlan[UNIFI_WPA3_SUPPORT]
+            wpa3_transition = wlan[UNIFI_WPA3_TRANSITION]
             if wpa3_support and not wpa3_transition:
                 auth_type = 'WPA3'
             elif wpa3_support and wpa3_transition:
@@ -352,52 +522,57 @@ class UnifiWifiImage(CoordinatorEntity, ImageEntity, RestoreEntity):
             else:
                 auth_type = 'WPA2'
 
-            if self._attributes[CONF_PPSK]:
-                idnetwork = self._network_index(self._attributes[UNIFI_NETWORKCONF_ID])
-                new_password = self.coordinator.wlanconf[idssid][UNIFI_PRESHARED_KEYS][idnetwork][UNIFI_PASSWORD]
-            else:
-                new_password = self.coordinator.wlanconf[idssid][UNIFI_X_PASSPHRASE]
+        return _SHARED(SsidState(wlan[UNIFI_ID], wlan[CONF_ENABLED], wlan[UNIFI_HIDE_SSID], auth_type))
 
-        enabled_change = bool(self._attributes[CONF_ENABLED] != enabled_state)
-        hide_change = bool(self._attributes[CONF_HIDE_SSID] != hide_state)
-        auth_change = bool(self._attributes[CONF_AUTH_TYPE] != auth_type)
-        password_change = bool(self._attributes[CONF_PASSWORD] != new_password)
+    def _wlan_password(self, wlan: dict, state: SsidState) -> str:
+        """Return the password of this image in a wlanconf entry."""
+        if state.auth_type == 'OPEN':
+            return 'nopass'
+        if self._key.network_id is not None:
+            return self._ppsk_conf(self._key.network_id)[UNIFI_PASSWORD]
+        return wlan[UNIFI_X_PASSPHRASE]
+
+    def _update_data(self) -> None:
+        """Update state and attributes when changes are detected."""
+        wlan = self._ssid_conf(self._options.ssid)
+        old = self._ssid_state
+        state = self._wlan_state(wlan)
+        new_password = self._wlan_password(wlan, state)
+
+        enabled_change = bool(old.enabled != state.enabled)
+        hide_change = bool(old.hide_ssid != state.hide_ssid)
+        auth_change = bool(old.auth_type != state.auth_type)
+        password_change = bool(self._key.password != new_password)
 
         if not (enabled_change or hide_change or auth_change or password_change):
             return
 
-        self._attributes[UNIFI_ID] = self.coordinator.wlanconf[idssid][UNIFI_ID]
+        self._ssid_state = state
 
         if enabled_change:
-            self._attributes[CONF_ENABLED] = enabled_state
-            _LOGGER.debug("SSID %s on coordinator %s is now %s", self._attributes[CONF_SSID], self._attributes[CONF_COORDINATOR], 'enabled' if bool(enabled_state) else 'disabled')
+            _LOGGER.debug("SSID %s on coordinator %s is now %s", self._options.ssid, self._options.coordinator, 'enabled' if bool(state.enabled) else 'disabled')
 
         create_qr = False
         if hide_change or auth_change or password_change:
-            self._attributes[CONF_HIDE_SSID] = hide_state
-            self._attributes[CONF_AUTH_TYPE] = auth_type
-            self._attributes[CONF_PASSWORD] = new_password
+            self._key.password = new_password
             dt = utcnow()
-            self._attributes[CONF_TIMESTAMP] = int(dt.timestamp())
-            self._attr_image_last_updated = dt
+            self._key.timestamp = int(dt.timestamp())
 
-            # Allow _create_qr() to be triggered after async_write_ha_state()
             create_qr = True
 
             if hide_change:
-                _LOGGER.debug("SSID %s on coordinator %s is now %s", self._attributes[CONF_SSID], self._attributes[CONF_COORDINATOR], 'hidden' if bool(hide_state) else 'broadcasting')
+                _LOGGER.debug("SSID %s on coordinator %s is now %s", self._options.ssid, self._options.coordinator, 'hidden' if bool(state.hide_ssid) else 'broadcasting')
 
             if auth_change:
-                _LOGGER.debug("SSID %s on coordinator %s is now in %s mode", self._attributes[CONF_SSID], self._attributes[CONF_COORDINATOR], auth_type)
+                _LOGGER.debug("SSID %s on coordinator %s is now in %s mode", self._options.ssid, self._options.coordinator, state.auth_type)
 
             if password_change:
-                if self._attributes[CONF_PPSK]:
-                    _LOGGER.debug("SSID (ppsk) %s (%s) on coordinator %s has a new password", self._attributes[CONF_SSID], self._attributes[CONF_NETWORK_NAME], self._attributes[CONF_COORDINATOR])
+                if self._key.network_id is not None:
+                    _LOGGER.debug("SSID (ppsk) %s (%s) on coordinator %s has a new password", self._options.ssid, self._key.network_name, self._options.coordinator)
                 else:
-                    _LOGGER.debug("SSID %s on coordinator %s has a new password", self._attributes[CONF_SSID], self._attributes[CONF_COORDINATOR])
-
-        self.async_write_ha_state()
+                    _LOGGER.debug("SSID %s on coordinator %s has a new password", self._options.ssid, self._options.coordinator)
 
-        # _create_qr() needs access to updated attributes
+        # _create_qr() needs access to updated attributes, and may update
+        # image_last_updated right away when no render is needed
         if create_qr:
-            self._create_qr()
\ No newline at end of file
+            self._create_qr(dt)
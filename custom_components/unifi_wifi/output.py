@@ -0,0 +1,105 @@
+"""Unifi Wifi QR code file output."""
+
+from __future__ import annotations
+
+import logging, asyncio, hashlib
+
+from collections.abc import Awaitable, Callable
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback, Event, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from . import qr
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to collect file writes before handing them to the executor together
+BATCH_DELAY = 1
+
+# Seconds to wait before rendering the files of lazily rendered images
+DEFERRED_DELAY = 30
+
+
+class QrFileWriter:
+    """Batched writer of QR code files in the www directory.
+
+    Every QR code rendered after one refresh is written by a single executor
+    job, and files that already hold the same content are left untouched.
+    Lazily rendered images defer their renders to a low-priority queue, which
+    renders them one at a time once things have settled.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the writer."""
+        self.hass = hass
+        self._hashes: dict[str, str] = {}
+        self._pending: dict[str, bytes] = {}
+        self._unsub_flush = None
+        self._deferred: dict[str, Callable[[], Awaitable]] = {}
+        self._deferred_task = None
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    @callback
+    def queue(self, path: str, data: bytes) -> None:
+        """Queue a file to be written with the next batch."""
+        if self._hashes.get(path) == hashlib.sha256(data).hexdigest():
+            # already written since startup
+            self._pending.pop(path, None)
+            return
+
+        self._pending[path] = data
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self.hass, BATCH_DELAY, self._handle_flush)
+
+    @callback
+    def defer(self, path: str, render: Callable[[], Awaitable]) -> None:
+        """Queue a render whose result is written to path with low priority."""
+        self._deferred[path] = render
+        if self._deferred_task is None:
+            self._deferred_task = self.hass.async_create_background_task(
+                self._async_run_deferred(), "unifi_wifi deferred qr file output"
+            )
+
+    @callback
+    def discard(self, path: str) -> None:
+        """Drop a deferred render."""
+        self._deferred.pop(path, None)
+
+    async def _async_run_deferred(self) -> None:
+        """Run the deferred renders one at a time."""
+        try:
+            await asyncio.sleep(DEFERRED_DELAY)
+            while self._deferred:
+                path = next(iter(self._deferred))
+                render = self._deferred.pop(path)
+                try:
+                    await render()
+                except Exception:
+                    _LOGGER.exception("Unable to render QR code file %s", path)
+        finally:
+            self._deferred_task = None
+
+    @callback
+    def _handle_flush(self, _now) -> None:
+        """Write the queued files."""
+        self._unsub_flush = None
+        self.hass.async_create_background_task(self.async_flush(), "unifi_wifi qr file output")
+
+    async def async_flush(self) -> None:
+        """Write the queued files in one executor job."""
+        if not self._pending:
+            return
+        files, self._pending = self._pending, {}
+        self._hashes.update(await self.hass.async_add_executor_job(qr.write_files, files))
+        _LOGGER.debug("Flushed %i QR code files", len(files))
+
+    async def _async_stop(self, _event: Event) -> None:
+        """Write any queued files before Home Assistant stops."""
+        if self._deferred_task is not None:
+            self._deferred_task.cancel()
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
@@ -1,30 +1,113 @@
 """Random password generation function."""
 
-import secrets, string
+from __future__ import annotations
+
+import bisect, functools, os, secrets, string
+
+from collections.abc import Iterable, Sequence
 
 from xkcdpass import xkcd_password as xp
 
-WORD_FILE = '/config/custom_components/unifi_wifi/eff_large_wordlist.txt'
-COLOR_FILE= '/config/custom_components/unifi_wifi/color_wordlist.txt'
-NOUN_FILE = '/config/custom_components/unifi_wifi/noun_wordlist.txt'
+# wordlists are shipped with the integration
+_PATH = os.path.dirname(__file__)
+WORD_FILE = os.path.join(_PATH, 'eff_large_wordlist.txt')
+COLOR_FILE = os.path.join(_PATH, 'color_wordlist.txt')
+NOUN_FILE = os.path.join(_PATH, 'noun_wordlist.txt')
+
+# digits appended to a rainbow password
+RAINBOW_SALT = 5
+
+# lengths of a WPA passphrase
+MIN_PASSWORD_LENGTH = 8
+MAX_PASSWORD_LENGTH = 63
+
+
+class WordSlice(Sequence):
+    """Read-only view of consecutive words of a WordIndex."""
+
+    __slots__ = ('_words', '_start', '_stop')
+
+    def __init__(self, words: Sequence[str], start: int, stop: int):
+        """Initialize the view."""
+        self._words = words
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._words[self._start:self._stop][i]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('word index out of range')
+        return self._words[self._start + i]
+
+
+class WordIndex:
+    """Immutable list of unique words, ordered and bucketed by length.
+
+    Words of every length form one consecutive run, so the words within any
+    range of lengths are a view of the list without copying or filtering.
+    The words can be any sequence, such as a tuple or a memory-mapped pack.
+    """
+
+    __slots__ = ('words', '_bounds')
+
+    def __init__(self, words: Sequence[str], bounds: tuple[int, ...]):
+        """Initialize the index.
 
+        words are ordered by length and bounds[n] is the position of the first
+        word longer than n - 1 characters, up to one past the longest word.
+        """
+        self.words = words
+        self._bounds = bounds
 
-def create(_method: str, _punctuation: bool, _delimiter: str, _min_length: int, _max_length: int, _word_count: int, _char_count: int):
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> WordIndex:
+        """Index unordered words in memory."""
+        words = tuple(sorted(set(words), key=lambda w: (len(w), w)))
+        lengths = [len(w) for w in words]
+        longest = lengths[-1] if lengths else 0
+        return cls(words, tuple(bisect.bisect_left(lengths, n) for n in range(longest + 2)))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def select(self, min_length: int = 0, max_length: int | None = None) -> WordSlice:
+        """Return the words with min_length to max_length characters."""
+        last = len(self._bounds) - 1
+        start = self._bounds[min(max(min_length, 0), last)]
+        stop = self._bounds[last if max_length is None else min(max(max_length + 1, 0), last)]
+        return WordSlice(self.words, start, max(start, stop))
+
+
+@functools.cache
+def wordlist(path: str) -> WordIndex:
+    """Load a wordlist of one word per line, once."""
+    with open(path, encoding='utf-8') as f:
+        return WordIndex.from_words(word for line in f if (word := line.strip()))
+
+
+def create(_method: str, _punctuation: bool, _delimiter: str, _min_length: int, _max_length: int, _word_count: int, _char_count: int, _words: WordIndex | None = None):
+    """Create a random password. _words replaces the EFF wordlist of the word and xkcd methods."""
     # https://github.com/redacted/XKCD-password-generator#using-xkcdpass-as-an-imported-module
     if _method == 'xkcd':
-        # xp.locate_wordfile() defaults to a looking for eff_long contained in xkcdpass python module
-        # however this is not available to the function so we specify a local copy of eff_long
-        # this file is located in the current working directory
-        mywords = xp.generate_wordlist(wordfile=WORD_FILE, min_length=_min_length, max_length=_max_length)
+        # xp.generate_wordlist() would re-read and filter the wordfile on every call,
+        # so xkcdpass is handed the words of the right lengths from the cached index
+        mywords = (_words or wordlist(WORD_FILE)).select(_min_length, _max_length)
+        if not mywords:
+            raise ValueError(f"No words of {_min_length} to {_max_length} characters")
         x = xp.generate_xkcdpassword(mywords, numwords=_word_count, delimiter=_delimiter)
 
     # this is basically the same as xkcd method but without extra specificity such as min and max lengths
     # On standard Linux systems, use a convenient dictionary file. Other platforms may need to provide their own word-list.
     # https://www.eff.org/files/2016/07/18/eff_large_wordlist.txt
     elif _method == 'word':
-        with open(WORD_FILE) as f:
-            words = [word.strip() for word in f]
-            x = _delimiter.join(secrets.choice(words) for i in range(_word_count))
+        words = (_words or wordlist(WORD_FILE)).words
+        x = _delimiter.join(secrets.choice(words) for i in range(_word_count))
 
     # https://docs.python.org/3/library/secrets.html#recipes-and-best-practices
     elif _method == 'char':
@@ -36,14 +119,55 @@ def create(_method: str, _punctuation: bool, _delimiter: str, _min_length: int,
         x = ''.join(secrets.choice(alphabet) for i in range(_char_count))
 
     elif _method == 'rainbow':
-        with open(COLOR_FILE) as f:
-            color = secrets.choice([c.strip() for c in f])
-        with open(NOUN_FILE) as f:
-            noun = secrets.choice([n.strip() for n in f])
-        salt = ''.join(secrets.choice(string.digits) for i in range(5))
+        color = secrets.choice(wordlist(COLOR_FILE).words)
+        noun = secrets.choice(wordlist(NOUN_FILE).words)
+        salt = ''.join(secrets.choice(string.digits) for i in range(RAINBOW_SALT))
         x = string.capwords(color) + string.capwords(noun) + salt
 
     else:
         raise ValueError(f"Method {_method} is not a valid option.")
 
-    return x
\ No newline at end of file
+    return x
+
+
+def length_range(_method: str, _delimiter: str, _min_length: int, _max_length: int, _word_count: int, _char_count: int, _words: WordIndex | None = None) -> tuple[int, int]:
+    """Return the shortest and longest password that create() can return with these settings."""
+    if _method in ('xkcd', 'word'):
+        words = _words or wordlist(WORD_FILE)
+        if _method == 'xkcd':
+            words = words.select(_min_length, _max_length)
+            if not words:
+                raise ValueError(f"No words of {_min_length} to {_max_length} characters")
+        else:
+            words = words.words
+        # words are ordered by length
+        delimiters = (_word_count - 1) * len(_delimiter)
+        return _word_count * len(words[0]) + delimiters, _word_count * len(words[-1]) + delimiters
+
+    if _method == 'char':
+        return _char_count, _char_count
+
+    if _method == 'rainbow':
+        colors = wordlist(COLOR_FILE).words
+        nouns = wordlist(NOUN_FILE).words
+        return len(colors[0]) + len(nouns[0]) + RAINBOW_SALT, len(colors[-1]) + len(nouns[-1]) + RAINBOW_SALT
+
+    raise ValueError(f"Method {_method} is not a valid option.")
+
+
+def create_batch(_count: int, _exclude: Iterable[str], _method: str, _punctuation: bool, _delimiter: str, _min_length: int, _max_length: int, _word_count: int, _char_count: int, _words: WordIndex | None = None) -> list[str]:
+    """Create _count unique passwords, none of which are in _exclude."""
+    seen = set(_exclude)
+    passwords = []
+    # collisions are rare with any valid settings, so only a hopeless request runs out of attempts
+    attempts = 100 * _count + 100
+    while len(passwords) < _count:
+        if attempts == 0:
+            raise ValueError(f"Unable to create {_count} unique passwords with method {_method}")
+        attempts -= 1
+        x = create(_method, _punctuation, _delimiter, _min_length, _max_length, _word_count, _char_count, _words)
+        if x not in seen:
+            seen.add(x)
+            passwords.append(x)
+
+    return passwords
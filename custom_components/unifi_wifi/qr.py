@@ -0,0 +1,273 @@
+"""QR code rendering and render cache."""
+
+from __future__ import annotations
+
+import logging, collections, contextlib, hashlib, io, os, qrcode
+
+from PIL import Image
+
+_LOGGER = logging.getLogger(__name__)
+
+ERROR_CORRECTION = {
+    'L': qrcode.constants.ERROR_CORRECT_L,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'H': qrcode.constants.ERROR_CORRECT_H
+}
+
+BOX_SIZE = 16
+BORDER = 2
+IMAGE_FORMAT = 'png'
+
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml'
+}
+
+
+def hex_to_rgb(value: str) -> tuple[int, int, int]:
+    """return an RGB tuple of a hex color."""
+    # https://stackoverflow.com/questions/29643352/converting-hex-to-rgb-value-in-python
+    value = value.lstrip('#')
+    return tuple(int(value[i:i+2], 16) for i in (0, 2, 4))
+
+
+def render_key(qrtext: str, fill_color: str, back_color: str, quality: str, box_size: int = BOX_SIZE, border: int = BORDER, image_format: str = IMAGE_FORMAT) -> str:
+    """Return the cache key of a QR code render, a hash of everything that affects the output."""
+    data = '\x1f'.join([qrtext, fill_color.lower(), back_color.lower(), quality, str(box_size), str(border), image_format])
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def matrix(qrtext: str, quality: str, border: int = BORDER) -> list[list[bool]]:
+    """Return the module matrix of a QR code, including the border."""
+    qr = qrcode.QRCode(
+        version = 1,
+        error_correction = ERROR_CORRECTION[quality],
+        border = border
+    )
+    qr.add_data(qrtext)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def image(modules: list[list[bool]], fill_color: str, back_color: str, box_size: int = BOX_SIZE) -> Image.Image:
+    """Return a module matrix as a two-color palette image."""
+    size = len(modules)
+    img = Image.frombytes('P', (size, size), bytes(v for row in modules for v in row))
+    img.putpalette([*hex_to_rgb(back_color), *hex_to_rgb(fill_color)])
+    return img.resize((size * box_size, size * box_size), Image.Resampling.NEAREST)
+
+
+def encode(modules: list[list[bool]], fill_color: str, back_color: str, box_size: int = BOX_SIZE) -> bytes:
+    """Encode a module matrix as a palette PNG.
+
+    Instead of drawing every dark module as a separate box, the matrix is
+    packed into one byte per module and upscaled in a single resize, which
+    gives the same pixels as the qrcode PIL factory.
+    """
+    img = image(modules, fill_color, back_color, box_size)
+
+    x = io.BytesIO()
+    img.save(x, format='PNG', bits=1)
+    return x.getvalue()
+
+
+def encode_svg(modules: list[list[bool]], fill_color: str, back_color: str, box_size: int = BOX_SIZE) -> bytes:
+    """Encode a module matrix as an SVG.
+
+    Each run of dark modules in a row becomes one segment of a single path, so
+    the size of the file depends on the QR code and not on box_size.
+    """
+    size = len(modules)
+    d = []
+    for y, row in enumerate(modules):
+        x = 0
+        while x < size:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < size and row[x]:
+                x += 1
+            d.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+
+    pixels = size * box_size
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="{back_color}"/>'
+        f'<path fill="{fill_color}" d="{"".join(d)}"/>'
+        '</svg>'
+    )
+    return svg.encode()
+
+
+def render(qrtext: str, fill_color: str, back_color: str, quality: str, box_size: int = BOX_SIZE, border: int = BORDER, image_format: str = IMAGE_FORMAT) -> bytes:
+    """Render a QR code as PNG or SVG bytes."""
+    modules = matrix(qrtext, quality, border)
+    if image_format == 'svg':
+        return encode_svg(modules, fill_color, back_color, box_size)
+    return encode(modules, fill_color, back_color, box_size)
+
+
+def write_file(path: str, data: bytes) -> None:
+    """Write bytes to a file, replacing it atomically.
+
+    Readers see either the old or the new file, never a partial one.
+    """
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def file_hash(path: str) -> str | None:
+    """Return the sha256 of a file, or None if it can't be read."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+    except OSError:
+        return None
+
+
+def write_files(files: dict[str, bytes]) -> dict[str, str]:
+    """Write files whose content differs from what is on disk.
+
+    Returns the sha256 of every file that is now up to date.
+    """
+    written = {}
+    for path, data in files.items():
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            if file_hash(path) != digest:
+                write_file(path, data)
+                _LOGGER.debug("Wrote QR code file %s", path)
+        except OSError as err:
+            _LOGGER.warning("Unable to write QR code file %s: %s", path, err)
+            continue
+        written[path] = digest
+    return written
+
+
+class QrRenderCache:
+    """Content-addressed cache of rendered QR codes.
+
+    Renders are kept in an in-memory LRU and persisted as files named by their
+    render key, so identical QR codes are not rendered again after a restart.
+    The LRU grows with reserve() to hold the QR code of every image, so the
+    limits only bound renders that are no longer served. load(), prune(),
+    read() and save() do file I/O and must run in an executor.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1024, max_files: int = 4096):
+        """Initialize the cache."""
+        self.path = path
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self._headroom = (max_entries, max_files)
+        self._reserved = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[str, bytes] = collections.OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached render of a key, if any."""
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Add a render to the in-memory LRU, evicting the least recently used entries."""
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def reserve(self, count: int) -> None:
+        """Make room for the QR codes of count more images on top of the initial limits."""
+        self._reserved += count
+        self.max_entries = self._headroom[0] + self._reserved
+        self.max_files = self._headroom[1] + self._reserved
+
+    def _file(self, key: str) -> str:
+        """Return the path of the persisted render of a key."""
+        return os.path.join(self.path, f"{key}.qr")
+
+    def _files(self) -> list[tuple[float, str, str]]:
+        """Return the mtime, name and path of every persisted render, most recent first."""
+        files = []
+        os.makedirs(self.path, exist_ok=True)
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.qr'):
+                    files.append((entry.stat().st_mtime, entry.name, entry.path))
+        files.sort(reverse=True)
+        return files
+
+    def load(self) -> None:
+        """Load the most recently written renders from disk.
+
+        Renders that don't fit in the LRU are read on demand with read().
+        """
+        try:
+            files = self._files()
+        except OSError as err:
+            _LOGGER.warning("Unable to read QR render cache %s: %s", self.path, err)
+            return
+
+        # insert oldest first so the most recently written renders are the last to be evicted
+        for _, name, path in reversed(files[:self.max_entries]):
+            try:
+                with open(path, 'rb') as f:
+                    self.put(name[:-3], f.read())
+            except OSError as err:
+                _LOGGER.debug("Unable to read QR render %s: %s", path, err)
+
+        _LOGGER.debug("Loaded %i of %i QR renders from %s", len(self._entries), len(files), self.path)
+
+    def prune(self) -> None:
+        """Remove the oldest persisted renders beyond max_files.
+
+        Run this once every image has reserved its place, so the renders of
+        live images are kept.
+        """
+        try:
+            files = self._files()
+        except OSError as err:
+            _LOGGER.warning("Unable to read QR render cache %s: %s", self.path, err)
+            return
+
+        for _, name, path in files[self.max_files:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def read(self, key: str) -> bytes | None:
+        """Return the persisted render of a key, if any."""
+        try:
+            with open(self._file(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def save(self, key: str, data: bytes) -> None:
+        """Persist a render to disk, unless an identical file is already there."""
+        path = self._file(key)
+        try:
+            if file_hash(path) == hashlib.sha256(data).hexdigest():
+                # keep it from being pruned as one of the oldest renders
+                os.utime(path)
+                return
+            os.makedirs(self.path, exist_ok=True)
+            write_file(path, data)
+        except OSError as err:
+            _LOGGER.warning("Unable to save QR render %s: %s", key, err)
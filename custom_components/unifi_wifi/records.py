@@ -0,0 +1,57 @@
+"""Compact state records of Unifi Wifi images."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class ImageOptions(NamedTuple):
+    """Configuration of an image, shared by every image configured the same way."""
+
+    coordinator: str
+    site: str
+    ssid: str
+    fill_color: str
+    back_color: str
+    file_output: bool
+    qr_quality: str
+    image_format: str
+    box_size: int
+    border: int
+    lazy_render: bool
+
+
+class SsidState(NamedTuple):
+    """SSID level state, shared by every image of an SSID."""
+
+    wlan_id: str
+    enabled: bool
+    hide_ssid: bool
+    auth_type: str
+
+
+class KeyState:
+    """State of the single network and password shown by an image."""
+
+    __slots__ = ('network_id', 'network_name', 'password', 'timestamp', 'qr_text', 'render_key')
+
+    def __init__(self, network_id: str | None, network_name: str | None, password: str, timestamp: int):
+        """Initialize the record."""
+        self.network_id = network_id
+        self.network_name = network_name
+        self.password = password
+        self.timestamp = timestamp
+        self.qr_text: str | None = None
+        self.render_key: str | None = None
+
+
+class Interner:
+    """Hand out one shared instance of every distinct immutable record."""
+
+    def __init__(self):
+        """Initialize the interner."""
+        self._values: dict = {}
+
+    def __call__(self, value):
+        """Return the shared instance equal to value."""
+        return self._values.setdefault(value, value)
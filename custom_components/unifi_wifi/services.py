@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import logging, asyncio, json
+import logging, aiohttp, asyncio, json, os, time
 import voluptuous as vol
 
 from homeassistant.auth.permissions.const import POLICY_CONTROL
@@ -10,49 +10,69 @@ from homeassistant.const import (
     CONF_ENABLED,
     CONF_ENTITY_ID,
     CONF_COMMAND,
+    CONF_FILENAME,
     CONF_METHOD,
     CONF_NAME,
     CONF_PASSWORD,
     CONF_PLATFORM,
     CONF_TARGET
 )
-from homeassistant.core import HomeAssistant, ServiceCall, Context
-from homeassistant.exceptions import InvalidEntityFormatError, ServiceValidationError, Unauthorized, IntegrationError
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, Context
+from homeassistant.exceptions import HomeAssistantError, InvalidEntityFormatError, ServiceValidationError, Unauthorized, UnknownUser, IntegrationError
 from homeassistant.helpers import config_validation as cv, entity_registry
 from homeassistant.helpers import service
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 from .const import (
     DOMAIN,
     CONF_CHAR_COUNT,
+    CONF_COLUMNS,
     CONF_COORDINATOR,
     CONF_DATA,
     CONF_DELIMITER,
+    CONF_ENTROPY,
+    CONF_FORMAT,
     CONF_HIDE_SSID,
     CONF_MANAGER,
     CONF_MAX_LENGTH,
     CONF_METHOD_TYPES,
     CONF_MIN_LENGTH,
+    CONF_NETWORK_NAME,
+    CONF_PAGE_SIZE,
     CONF_PPSK,
     CONF_PUNCTUATION,
+    CONF_QR_QUALITY,
+    CONF_QR_TEXT,
     CONF_RANDOM,
+    CONF_RESULTS,
+    CONF_ROWS,
+    CONF_SHOW_PASSWORD,
     CONF_SSID,
     CONF_WORD_COUNT,
+    CONF_WORDLIST,
     UNIFI_COMMANDS,
     UNIFI_HIDE_SSID,
     UNIFI_MANAGERS,
-    UNIFI_NAME,
     UNIFI_NETWORKCONF_ID,
     UNIFI_X_PASSPHRASE,
     UNIFI_X_PASSWORD,
     UNIFI_PRESHARED_KEYS
 )
 from .coordinator import UnifiWifiCoordinator
-from . import password as pw
+from . import entropy, password as pw, sheet, wordpack
+
+# Custom wordlist packs in the config directory, compiled into the storage directory
+WORDLIST_DIR = f"{DOMAIN}_wordlists"
+
+# Coordinators written to at the same time by all actions together; each controller is written to by one coordinator at a time
+MAX_CONCURRENT_WRITES = 4
 
 SERVICE_ENABLE_WLAN = 'enable_wlan'
 SERVICE_HIDE_SSID = 'hide_ssid'
 SERVICE_HOTSPOT_PASSWORD = 'hotspot_password'
+SERVICE_QR_SHEET = 'qr_sheet'
 SERVICE_SEND_COMMAND = 'send_command'
 SERVICE_WLAN_PASSWORD = 'wlan_password'
 
@@ -81,6 +101,14 @@ def _check_custom_password(obj: ConfigType):
         obj[CONF_RANDOM] = True
     return obj
 
+def _check_sheet_target(obj: ConfigType):
+    """Verify a sheet has either image targets or a coordinator."""
+    if (CONF_TARGET in obj) == (CONF_COORDINATOR in obj):
+        raise vol.Invalid(f"Provide either {CONF_TARGET} or {CONF_COORDINATOR}")
+    if CONF_SSID in obj and CONF_COORDINATOR not in obj:
+        raise vol.Invalid(f"{CONF_SSID} requires {CONF_COORDINATOR}")
+    return obj
+
 def _check_word_lengths(obj: ConfigType):
     """Verify minimum and maximum word lengths are logical."""
     if obj[CONF_MIN_LENGTH] > obj[CONF_MAX_LENGTH]:
@@ -118,7 +146,8 @@ PASSWORD_SCHEMA = vol.Schema({
     ),
     vol.Optional(CONF_CHAR_COUNT, default=24): vol.All(
         vol.Coerce(int), vol.Range(min=8, max=63)
-    )
+    ),
+    vol.Optional(CONF_WORDLIST): cv.slug
 })
 
 SERVICE_ENABLE_WLAN_SCHEMA = vol.Schema({
@@ -139,6 +168,25 @@ SERVICE_HOTSPOT_PASSWORD_SCHEMA = vol.All(
     _check_word_lengths
 )
 
+SERVICE_QR_SHEET_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Optional(CONF_TARGET): TARGET_SCHEMA,
+        vol.Optional(CONF_COORDINATOR): cv.string,
+        vol.Optional(CONF_SSID): cv.string,
+        vol.Optional(CONF_FORMAT, default='pdf'): vol.In(['pdf','png']),
+        vol.Optional(CONF_FILENAME, default='unifi_wifi_qr_sheet'): cv.string,
+        vol.Optional(CONF_PAGE_SIZE, default='a4'): vol.In(list(sheet.PAGE_SIZES)),
+        vol.Optional(CONF_COLUMNS, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=6)
+        ),
+        vol.Optional(CONF_ROWS, default=4): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=8)
+        ),
+        vol.Optional(CONF_SHOW_PASSWORD, default=True): cv.boolean,
+    }),
+    _check_sheet_target
+)
+
 SERVICE_SEND_COMMAND_SCHEMA = vol.Schema({
     vol.Required(CONF_COORDINATOR): cv.string,
     vol.Required(CONF_MANAGER): cv.string,
@@ -157,26 +205,56 @@ SERVICE_WLAN_PASSWORD_SCHEMA = vol.All(
 
 async def register_services(hass: HomeAssistant, coordinators: list[UnifiWifiCoordinator]) -> bool:
 
-    def _coordinator_index(_coordinator: str):
-        """Find the index of a specific coordinator."""
+    coordinator_names = {x.name: x for x in coordinators}
+
+    write_limit = asyncio.Semaphore(MAX_CONCURRENT_WRITES)
+    controller_locks = {x.controller: asyncio.Lock() for x in coordinators}
+
+    def _coordinator(_coordinator: str) -> UnifiWifiCoordinator:
+        """Find a specific coordinator by name."""
         try:
-            return [x.name for x in coordinators].index(_coordinator)
-        except ValueError as err:
+            return coordinator_names[_coordinator]
+        except KeyError as err:
             raise ServiceValidationError(f"Coordinator {_coordinator} is not configured in YAML: {err}")
 
 
-    def _ssid_index(_index: int, _ssid: str):
-        """Find the index of an ssid on a specific coordinator."""
-        hass.add_job(coordinators[_index].async_request_refresh())
-
+    def _ssid_conf(_coordinator: UnifiWifiCoordinator, _ssid: str) -> dict:
+        """Find the wlanconf entry of an ssid on a specific coordinator."""
         try:
-            return [x[UNIFI_NAME] for x in coordinators[_index].wlanconf].index(_ssid)
-        except ValueError as err:
-            raise ServiceValidationError(f"SSID {_ssid} does not exist on coordinator {coordinators[_index].name}: {err}")
+            return _coordinator.ssids[_ssid]
+        except KeyError as err:
+            raise ServiceValidationError(f"SSID {_ssid} does not exist on coordinator {_coordinator.name}: {err}")
+
+
+    def _ppsk_payload(_coordinator: UnifiWifiCoordinator, _ssid: str, _passwords: dict[str, str]) -> list[dict]:
+        """Build the full private preshared key list of an ssid with new passwords for some of its networks."""
+        keys = []
+        replaced = set()
+        for key in _ssid_conf(_coordinator, _ssid).get(UNIFI_PRESHARED_KEYS, []):
+            network_id = key[UNIFI_NETWORKCONF_ID]
+            # only the first key of a network is changed, which matches how image entities are created
+            if network_id in _passwords and network_id not in replaced:
+                key = {
+                    CONF_PASSWORD: _passwords[network_id],
+                    UNIFI_NETWORKCONF_ID: network_id
+                }
+                replaced.add(network_id)
+            keys.append(key)
 
+        # check for unique ppsk passwords on the ssid
+        passwords = [x[CONF_PASSWORD] for x in keys]
+        if len(set(passwords)) != len(passwords):
+            raise IntegrationError("Networks on the same PPSK-enabled SSID cannot have the same password")
 
-    async def _random_password(call: ServiceCall) -> str:
-        """SOMETHING DESCRIPTIVE."""
+        return keys
+
+
+    async def _random_passwords(call: ServiceCall, count: int, min_entropy: float, exclude: set[str] | None = None) -> tuple[list[str], float]:
+        """Create count unique random passwords, none of which are in exclude, and return them with their entropy.
+
+        Settings with less than min_entropy bits of entropy, or that can create passwords WPA doesn't
+        accept, are rejected before any password is created.
+        """
         method = call.data.get(CONF_METHOD)
         punctuation = call.data.get(CONF_PUNCTUATION)
         delimiter = call.data.get(CONF_DELIMITER)
@@ -184,10 +262,51 @@ async def register_services(hass: HomeAssistant, coordinators: list[UnifiWifiCoo
         max_length = call.data.get(CONF_MAX_LENGTH)
         word_count = call.data.get(CONF_WORD_COUNT)
         char_count = call.data.get(CONF_CHAR_COUNT)
+        words = await _wordlist(call.data.get(CONF_WORDLIST))
+
+        try:
+            bits = await hass.async_add_executor_job(entropy.bits, method, punctuation, min_length, max_length, word_count, char_count, words)
+            if bits < min_entropy:
+                raise ServiceValidationError(f"A {method} password with these settings has {bits} bits of entropy, less than the minimum of {min_entropy} bits")
+
+            # custom wordlists can hold words of any length up to a whole passphrase
+            shortest, longest = await hass.async_add_executor_job(pw.length_range, method, delimiter, min_length, max_length, word_count, char_count, words)
+            if shortest < pw.MIN_PASSWORD_LENGTH or longest > pw.MAX_PASSWORD_LENGTH:
+                raise ServiceValidationError(
+                    f"A {method} password with these settings has {shortest} to {longest} characters, "
+                    f"but must have {pw.MIN_PASSWORD_LENGTH} to {pw.MAX_PASSWORD_LENGTH} characters"
+                )
+
+            passwords = await hass.async_add_executor_job(
+                pw.create_batch, count, exclude or set(), method, punctuation, delimiter, min_length, max_length, word_count, char_count, words
+            )
+        except ValueError as err:
+            raise IntegrationError(err) from err
+
+        return passwords, bits
+
+
+    async def _wordlist(name: str | None) -> pw.WordIndex | None:
+        """Load a custom wordlist pack, which is only read once it is used."""
+        if name is None:
+            return None
+        directory = hass.config.path(WORDLIST_DIR)
+        try:
+            return await hass.async_add_executor_job(wordpack.load, directory, hass.config.path(STORAGE_DIR, WORDLIST_DIR), name)
+        except FileNotFoundError as err:
+            raise ServiceValidationError(f"Wordlist {name} does not exist in {directory}: {err}") from err
+        except (OSError, ValueError) as err:
+            raise ServiceValidationError(f"Unable to load wordlist {name}: {err}") from err
 
-        password = await hass.async_add_executor_job(pw.create, method, punctuation, delimiter, min_length, max_length, word_count, char_count)
 
-        return password
+    async def _check_admin(call: ServiceCall) -> None:
+        """Raise unless the call was made by an admin, for services registered directly to return a response."""
+        if call.context.user_id:
+            user = await hass.auth.async_get_user(call.context.user_id)
+            if user is None:
+                raise UnknownUser(context = call.context)
+            if not user.is_admin:
+                raise Unauthorized(context = call.context)
 
 
     async def _valid_entity_states(_target: str | list[str], _context: Context) -> list[str]:
@@ -230,95 +349,195 @@ async def register_services(hass: HomeAssistant, coordinators: list[UnifiWifiCoo
         return states
 
 
-    async def _ssid_requests(states: list[str], key: str, value: str, force: bool = False):
+    async def _write_wlanconfs(coordinator: UnifiWifiCoordinator, payloads: dict[str, dict], force: bool) -> dict[str, dict]:
+        """Write the SSID payloads of one coordinator and return the result of each SSID."""
+        if EXTRA_DEBUG: _LOGGER.debug("coordinator %s with payloads %s", coordinator.name, payloads)
+        # wait for the controller before taking one of the shared slots
+        async with controller_locks[coordinator.controller], write_limit:
+            start = time.monotonic()
+            # a hanging controller would otherwise hold its lock and a shared slot
+            timeout = coordinator.write_timeout(len(payloads))
+            try:
+                async with asyncio.timeout(timeout):
+                    errors, provision = await coordinator.set_wlanconfs(payloads, force)
+            except TimeoutError:
+                _LOGGER.warning("Timed out updating SSIDs %s on coordinator %s after %i seconds", list(payloads), coordinator.name, timeout)
+                errors, provision = dict.fromkeys(payloads, f"timed out after {timeout} seconds"), None
+            except (aiohttp.ClientError, HomeAssistantError) as err:
+                _LOGGER.warning("Unable to update SSIDs %s on coordinator %s: %s", list(payloads), coordinator.name, err)
+                errors, provision = dict.fromkeys(payloads, err), None
+            # SSIDs of a coordinator are written and provisioned as one batch, which is what the duration covers
+            duration = round(time.monotonic() - start, 3)
+
+        return {
+            ssid: {
+                'success': ssid not in errors,
+                'error': str(errors[ssid]) if ssid in errors else None,
+                'duration': duration,
+                'provision': provision
+            }
+            for ssid in payloads
+        }
+
+
+    async def _dispatch(call: ServiceCall, requests: dict[str, dict[str, dict]], force: bool) -> dict[str, dict]:
+        """Write the SSID payloads of every coordinator concurrently and return the results by coordinator and SSID.
+
+        Every write is attempted. When the caller doesn't want a response, failures are raised afterwards.
+        """
+        names = list(requests)
+        results = await asyncio.gather(*(
+            _write_wlanconfs(_coordinator(name), requests[name], force) for name in names
+        ))
+        response = dict(zip(names, results))
+
+        failed = [
+            f"SSID {ssid} on coordinator {name} ({result['error']})"
+            for name, ssids in response.items() for ssid, result in ssids.items() if not result['success']
+        ]
+        # every SSID of a coordinator shares its provision wave
+        failed += [
+            f"access points of coordinator {name} ({provision['error']})"
+            for name, ssids in response.items()
+            if (provision := next(iter(ssids.values()))['provision']) and provision['error']
+        ]
+        if failed and not call.return_response:
+            raise IntegrationError(f"Unable to update {', '.join(failed)}")
+        return response
+
+
+    async def _ssid_requests(call: ServiceCall, states: list[str], key: str, value: str, force: bool = False) -> dict[str, dict]:
         """Used to make SSID level API changes."""
         """This does not work (yet?) for PPSK level changes."""
 
-        requests = []
+        requests = {}
         for entity in states:
-            idcoord = _coordinator_index(entity.attributes.get(CONF_COORDINATOR))
-            coordinator = coordinators[idcoord]
+            coordinator = _coordinator(entity.attributes.get(CONF_COORDINATOR))
             ssid = entity.attributes.get(CONF_SSID)
 
-            try:
-                idrequestcoord = [x[CONF_COORDINATOR] for x in requests].index(entity.attributes.get(CONF_COORDINATOR))
-                if EXTRA_DEBUG: _LOGGER.debug("found coordinator entry in the requests list")
-                try:
-                    idrequestssid = [y[CONF_SSID] for y in requests[idrequestcoord][CONF_DATA]].index(entity.attributes.get(CONF_SSID))
-                    if EXTRA_DEBUG: _LOGGER.debug("found ssid entry in the requests list")
-                    # do nothing since editing the same SSID multiple times is redundant
-                    # requests[idrequestcoord][CONF_DATA][idrequestssid][key] = value
-                except ValueError:
-                    entry = {
-                        CONF_SSID: ssid,
-                        key: value
-                    }
-                    requests[idrequestcoord][CONF_DATA].append(entry)
-                    if EXTRA_DEBUG: _LOGGER.debug("new ssid entry created in the requests list")
-            except ValueError:
-                entry = {
-                    CONF_COORDINATOR: entity.attributes.get(CONF_COORDINATOR),
-                    CONF_DATA: [{
-                        CONF_SSID: ssid,
-                        key: value
-                    }]
-                }
-                requests.append(entry)
-                if EXTRA_DEBUG: _LOGGER.debug("new coordinator entry created in the requests list")
+            # editing the same SSID multiple times is redundant, so only the first entry is kept
+            if EXTRA_DEBUG and ssid in requests.get(coordinator.name, {}): _LOGGER.debug("found ssid entry in the requests list")
+            requests.setdefault(coordinator.name, {}).setdefault(ssid, {key: value})
 
-        # send wlanconf change requests to controllers
+        # send wlanconf change requests to controllers, one batch per coordinator
+        # boolean python values (uppercase) need to be json serialized (lowercase)
+        # payload = json.dumps({key: y[key]})
+        # apparently, the capitalized boolean value is actually REQUIRED ... weird
         if EXTRA_DEBUG: _LOGGER.debug("requests: %s", requests)
-        for request in requests:
-            idcoord = _coordinator_index(request[CONF_COORDINATOR])
-            coordinator = coordinators[idcoord]
-            for r in request[CONF_DATA]:
-                # boolean python values (uppercase) need to be json serialized (lowercase)
-                # payload = json.dumps({key: y[key]})
-                # apparently, the capitalized boolean value is actually REQUIRED ... weird
-                payload = {key: r[key]}
-                if EXTRA_DEBUG: _LOGGER.debug("ssid %s with payload %s", r[CONF_SSID], payload)
-                await coordinator.set_wlanconf(r[CONF_SSID], payload, force)
-
-
-    async def enable_wlan_service(call: ServiceCall):
+        return await _dispatch(call, requests, force)
+
+
+    async def enable_wlan_service(call: ServiceCall) -> ServiceResponse:
         """Enable or disable an SSID."""
+        await _check_admin(call)
+
         states = await _valid_entity_states(call.data.get(CONF_TARGET), call.context)
 
         enabled = call.data.get(CONF_ENABLED)
 
-        await _ssid_requests(states, CONF_ENABLED, enabled, True)
+        return {CONF_RESULTS: await _ssid_requests(call, states, CONF_ENABLED, enabled, True)}
 
 
-    async def hide_ssid_service(call: ServiceCall):
+    async def hide_ssid_service(call: ServiceCall) -> ServiceResponse:
         """Toggle hiding an SSID."""
+        await _check_admin(call)
+
         states = await _valid_entity_states(call.data.get(CONF_TARGET), call.context)
 
         hide_ssid = call.data.get(CONF_HIDE_SSID)
 
-        await _ssid_requests(states, UNIFI_HIDE_SSID, hide_ssid, True)
+        return {CONF_RESULTS: await _ssid_requests(call, states, UNIFI_HIDE_SSID, hide_ssid, True)}
 
 
-    async def hotspot_password_service(call: ServiceCall):
+    async def hotspot_password_service(call: ServiceCall) -> ServiceResponse:
         """Set a new hotspot password."""
+        await _check_admin(call)
+
         target = call.data.get(CONF_COORDINATOR)
-        idcoord = _coordinator_index(target)
-        coordinator = coordinators[idcoord]
+        coordinator = _coordinator(target)
 
         random = call.data.get(CONF_RANDOM)
         if not random:
             password = call.data.get(CONF_PASSWORD)
+            bits = None
         else:
-            password = await _random_password(call)
+            passwords, bits = await _random_passwords(call, 1, coordinator.min_entropy)
+            password = passwords[0]
 
         payload = {"password_enabled": True, UNIFI_X_PASSWORD: password}
-        await coordinator.set_restsetting("guest_access", payload, False)
+        async with controller_locks[coordinator.controller]:
+            await coordinator.set_restsetting("guest_access", payload, False)
+
+        return {CONF_ENTROPY: bits}
+
+
+    async def qr_sheet_service(call: ServiceCall) -> ServiceResponse:
+        """Write the QR codes of many images to a printable PDF or PNG pages."""
+        await _check_admin(call)
+
+        if CONF_TARGET in call.data:
+            states = await _valid_entity_states(call.data.get(CONF_TARGET), call.context)
+        else:
+            coordinator = _coordinator(call.data.get(CONF_COORDINATOR))
+            ssid = call.data.get(CONF_SSID)
+            if ssid is not None:
+                _ssid_conf(coordinator, ssid)
+
+            ent_reg = entity_registry.async_get(hass)
+            states = []
+            for entry in ent_reg.entities.values():
+                if entry.platform != DOMAIN or (state := hass.states.get(entry.entity_id)) is None:
+                    continue
+                if state.attributes.get(CONF_COORDINATOR) == coordinator.name and ssid in (None, state.attributes.get(CONF_SSID)):
+                    states.append(state)
+
+        show_password = call.data.get(CONF_SHOW_PASSWORD)
+        cards = []
+        for state in sorted(filter(None, states), key=lambda x: (x.attributes.get(CONF_SSID, ''), x.attributes.get(CONF_NETWORK_NAME, ''))):
+            if CONF_QR_TEXT not in state.attributes:
+                continue
+            labels = [f"SSID: {state.attributes.get(CONF_SSID)}"]
+            if state.attributes.get(CONF_PPSK):
+                labels.append(f"Network: {state.attributes.get(CONF_NETWORK_NAME)}")
+            if show_password:
+                labels.append(f"Password: {state.attributes.get(CONF_PASSWORD)}")
+            cards.append((state.attributes[CONF_QR_TEXT], state.attributes.get(CONF_QR_QUALITY, 'M'), labels))
+
+        if not cards:
+            raise ServiceValidationError("No unifi_wifi images found to put on a QR code sheet")
+
+        filename = slugify(call.data.get(CONF_FILENAME))
+        page_size = call.data.get(CONF_PAGE_SIZE)
+        columns = call.data.get(CONF_COLUMNS)
+        rows = call.data.get(CONF_ROWS)
+        www = hass.config.path('www')
+
+        def _write() -> list[str]:
+            os.makedirs(www, exist_ok=True)
+            if call.data.get(CONF_FORMAT) == 'pdf':
+                path = os.path.join(www, f"{filename}.pdf")
+                sheet.write_pdf(path, cards, page_size, columns, rows)
+                return [path]
+            return sheet.write_png(os.path.join(www, filename), cards, page_size, columns, rows)
+
+        # pages are written one at a time in the executor, so memory use doesn't grow with the number of codes
+        try:
+            paths = await hass.async_add_executor_job(_write)
+        except (OSError, ValueError) as err:
+            raise IntegrationError(f"Unable to write QR code sheet {filename}: {err}") from err
+
+        _LOGGER.debug("Wrote %i QR codes to %s", len(cards), paths)
+        return {
+            'codes': len(cards),
+            'paths': paths,
+            'urls': [f"/local/{os.path.basename(path)}" for path in paths]
+        }
 
 
     async def send_command_service(call: ServiceCall):
         """Send a command."""
         target = call.data.get(CONF_COORDINATOR)
-        idcoord = _coordinator_index(target)
-        coordinator = coordinators[idcoord]
+        coordinator = _coordinator(target)
 
         manager = call.data.get(CONF_MANAGER)
         if not manager in UNIFI_MANAGERS:
@@ -339,128 +558,114 @@ async def register_services(hass: HomeAssistant, coordinators: list[UnifiWifiCoo
         await coordinator.send_command(manager, json)
 
 
-    async def wlan_password_service(call: ServiceCall):
+    async def wlan_password_service(call: ServiceCall) -> ServiceResponse:
         """Set a new wlan password."""
-        states = await _valid_entity_states(call.data.get(CONF_TARGET), call.context)
+        await _check_admin(call)
 
-        random = call.data.get(CONF_RANDOM)
-        if not random:
-            password = call.data.get(CONF_PASSWORD)
+        states = await _valid_entity_states(call.data.get(CONF_TARGET), call.context)
 
-        # create list of wlan configurations to be sent to controllers
-        requests = []
+        # find the coordinator, ssid and network of every entity
+        targets = []
         for entity in states:
-            idcoord = _coordinator_index(entity.attributes.get(CONF_COORDINATOR))
-            coordinator = coordinators[idcoord]
+            coordinator = _coordinator(entity.attributes.get(CONF_COORDINATOR))
             ssid = entity.attributes.get(CONF_SSID)
+            _ssid_conf(coordinator, ssid)
 
-            if random:
-                password = await _random_password(call)
-
-            ppsk = bool(entity.attributes.get(CONF_PPSK))
-            if ppsk:
-                keys = coordinator.wlanconf[_ssid_index(idcoord, ssid)][UNIFI_PRESHARED_KEYS]
+            network_id = None
+            if entity.attributes.get(CONF_PPSK):
                 network_id = entity.attributes.get(UNIFI_NETWORKCONF_ID)
-                idkey = [x[UNIFI_NETWORKCONF_ID] for x in keys].index(network_id)
-
-            try:
-                idrequestcoord = [x[CONF_COORDINATOR] for x in requests].index(entity.attributes.get(CONF_COORDINATOR))
-                if EXTRA_DEBUG: _LOGGER.debug("found coordinator entry in requests list")
-                try:
-                    idrequestssid = [y[CONF_SSID] for y in requests[idrequestcoord][CONF_DATA]].index(entity.attributes.get(CONF_SSID))
-                    if EXTRA_DEBUG: _LOGGER.debug("found ssid entry in requests list")
-                    if ppsk:
-                        # check for unique ppsk passwords on a found ssid request
-                        if password in [x[CONF_PASSWORD] for x in requests[idrequestcoord][CONF_DATA][idrequestssid][UNIFI_PRESHARED_KEYS]]:
-                            raise IntegrationError("Networks on the same PPSK-enabled SSID cannot have the same password")
-
-                        requests[idrequestcoord][CONF_DATA][idrequestssid][UNIFI_PRESHARED_KEYS][idkey] = {
-                            CONF_PASSWORD: password,
-                            UNIFI_NETWORKCONF_ID: network_id
-                        }
-                        if EXTRA_DEBUG: _LOGGER.debug("ppsk entry updated in requests list")
-                    else:
-                        # this condition should not be possible unless somehow two or more entities
-                        # with the same coordinator AND ssid AND no private preshared keys
-                        # are created and selected
-                        requests[idrequestcoord][CONF_DATA][idrequestssid][CONF_PASSWORD] = password
-                except ValueError:
-                    if ppsk:
-                        keys[idkey] = {
-                            CONF_PASSWORD: password,
-                            UNIFI_NETWORKCONF_ID: network_id
-                        }
-                        entry = {
-                            CONF_SSID: ssid,
-                            UNIFI_PRESHARED_KEYS: keys
-                        }
-                    else:
-                        entry = {
-                            CONF_SSID: ssid,
-                            CONF_PASSWORD: password
-                        }
-                    requests[idrequestcoord][CONF_DATA].append(entry)
-                    if EXTRA_DEBUG: _LOGGER.debug("new ssid entry created in requests list")
-            except ValueError:
-                if ppsk:
-                    keys[idkey] = {
-                        CONF_PASSWORD: password,
-                        UNIFI_NETWORKCONF_ID: network_id
-                    }
-                    entry = {
-                        CONF_COORDINATOR: entity.attributes.get(CONF_COORDINATOR),
-                        CONF_DATA: [{
-                            CONF_SSID: ssid,
-                            UNIFI_PRESHARED_KEYS: keys
-                        }]
-                    }
-                else:
-                    entry = {
-                        CONF_COORDINATOR: entity.attributes.get(CONF_COORDINATOR),
-                        CONF_DATA: [{
-                            CONF_SSID: ssid,
-                            CONF_PASSWORD: password
-                        }]
-                    }
-                requests.append(entry)
-                if EXTRA_DEBUG: _LOGGER.debug("new coordinator entry created in requests list")
-
-        # send wlanconf change requests to controllers
+                if network_id not in coordinator.ppsks[ssid]:
+                    raise ServiceValidationError(f"Network {network_id} does not exist under SSID {ssid} on coordinator {coordinator.name}")
+            targets.append((coordinator, ssid, network_id))
+
+        if call.data.get(CONF_RANDOM):
+            # every random password is created at once, avoiding the passwords of
+            # private preshared keys that are kept on the same ssids
+            changed = {}
+            for coordinator, ssid, network_id in targets:
+                if network_id is not None:
+                    changed.setdefault((coordinator, ssid), set()).add(network_id)
+            kept = set()
+            for (coordinator, ssid), network_ids in changed.items():
+                for key in _ssid_conf(coordinator, ssid).get(UNIFI_PRESHARED_KEYS, []):
+                    network_id = key[UNIFI_NETWORKCONF_ID]
+                    # only the first key of a network is changed
+                    if network_id not in network_ids or key is not coordinator.ppsks[ssid][network_id]:
+                        kept.add(key[CONF_PASSWORD])
+            # the strictest policy of the affected coordinators applies
+            min_entropy = max((coordinator.min_entropy for coordinator, _, _ in targets), default=0)
+            passwords, bits = await _random_passwords(call, len(targets), min_entropy, kept)
+        else:
+            passwords = [call.data.get(CONF_PASSWORD)] * len(targets)
+            bits = None
+
+        # create wlan configurations to be sent to controllers, grouped by coordinator and ssid
+        requests = {}
+        for (coordinator, ssid, network_id), password in zip(targets, passwords):
+            # remembered for the image attributes, which only show it while the password is unchanged
+            if bits is None:
+                coordinator.entropy.pop((ssid, network_id), None)
+            else:
+                coordinator.entropy[(ssid, network_id)] = (password, bits)
+
+            request = requests.setdefault(coordinator.name, {})
+            if network_id is not None:
+                request.setdefault(ssid, {CONF_PPSK: {}})[CONF_PPSK][network_id] = password
+            else:
+                # two or more entities with the same coordinator AND ssid AND no private
+                # preshared keys should not be possible; the last password wins
+                request[ssid] = {CONF_PASSWORD: password}
+
+        # build every payload before anything is sent, so an invalid one stops the whole action
         if EXTRA_DEBUG: _LOGGER.debug("requests: %s", requests)
-        for request in requests:
-            idcoord = _coordinator_index(request[CONF_COORDINATOR])
-            coordinator = coordinators[idcoord]
-            for r in request[CONF_DATA]:
-                try:
-                    payload = {UNIFI_PRESHARED_KEYS: r[UNIFI_PRESHARED_KEYS]}
-                except:
+        payloads = {}
+        for name, request in requests.items():
+            coordinator = _coordinator(name)
+            for ssid, r in request.items():
+                if CONF_PPSK in r:
+                    payload = {UNIFI_PRESHARED_KEYS: _ppsk_payload(coordinator, ssid, r[CONF_PPSK])}
+                else:
                     payload = {UNIFI_X_PASSPHRASE: r[CONF_PASSWORD]}
-                if EXTRA_DEBUG: _LOGGER.debug("ssid %s with payload %s", r[CONF_SSID], payload)
-                await coordinator.set_wlanconf(r[CONF_SSID], payload, False)
+                if EXTRA_DEBUG: _LOGGER.debug("ssid %s with payload %s", ssid, payload)
+                payloads.setdefault(name, {})[ssid] = payload
 
+        # send wlanconf change requests to controllers, one batch per coordinator
+        return {
+            CONF_ENTROPY: bits,
+            CONF_RESULTS: await _dispatch(call, payloads, False)
+        }
 
-    async_register_admin_service(
-        hass,
+
+    hass.services.async_register(
         DOMAIN,
         SERVICE_ENABLE_WLAN,
         enable_wlan_service,
-        schema=SERVICE_ENABLE_WLAN_SCHEMA
+        schema=SERVICE_ENABLE_WLAN_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
     )
 
-    async_register_admin_service(
-        hass,
+    hass.services.async_register(
         DOMAIN,
         SERVICE_HIDE_SSID,
         hide_ssid_service,
-        schema=SERVICE_HIDE_SSID_SCHEMA
+        schema=SERVICE_HIDE_SSID_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
     )
 
-    async_register_admin_service(
-        hass,
+    hass.services.async_register(
         DOMAIN,
         SERVICE_HOTSPOT_PASSWORD,
         hotspot_password_service,
-        schema=SERVICE_HOTSPOT_PASSWORD_SCHEMA
+        schema=SERVICE_HOTSPOT_PASSWORD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QR_SHEET,
+        qr_sheet_service,
+        schema=SERVICE_QR_SHEET_SCHEMA,
+        supports_response=SupportsResponse.ONLY
     )
 
     async_register_admin_service(
@@ -471,12 +676,12 @@ async def register_services(hass: HomeAssistant, coordinators: list[UnifiWifiCoo
         schema=SERVICE_SEND_COMMAND_SCHEMA
     )
 
-    async_register_admin_service(
-        hass,
+    hass.services.async_register(
         DOMAIN,
         SERVICE_WLAN_PASSWORD,
         wlan_password_service,
-        schema=SERVICE_WLAN_PASSWORD_SCHEMA
+        schema=SERVICE_WLAN_PASSWORD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
     )
 
     return True
\ No newline at end of file
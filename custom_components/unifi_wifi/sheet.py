@@ -0,0 +1,252 @@
+"""Printable sheets of QR codes."""
+
+from __future__ import annotations
+
+import logging, contextlib, io, itertools, os, zlib
+
+from collections.abc import Iterable, Iterator
+
+from PIL import Image, ImageDraw, ImageFont
+
+from . import qr
+
+_LOGGER = logging.getLogger(__name__)
+
+# Page sizes in points (1/72 inch)
+PAGE_SIZES = {
+    'a4': (595, 842),
+    'letter': (612, 792)
+}
+
+MARGIN = 36
+PADDING = 6
+FONT_SIZE = 9
+LINE_HEIGHT = 11
+
+# Resolution of PNG pages
+PNG_DPI = 150
+
+# A card is the text and error correction level of a QR code, and the label lines printed below it
+Card = tuple[str, str, list[str]]
+
+
+def _pages(cards: Iterable[Card], per_page: int) -> Iterator[list[Card]]:
+    """Split cards into pages."""
+    it = iter(cards)
+    while page := list(itertools.islice(it, per_page)):
+        yield page
+
+
+def _nonempty(cards: Iterable[Card]) -> Iterator[Card]:
+    """Return an iterator of cards, or raise ValueError if there are none."""
+    it = iter(cards)
+    first = next(it, None)
+    if first is None:
+        raise ValueError("No QR codes to write")
+    return itertools.chain([first], it)
+
+
+def _cell_width(page_size: str, columns: int) -> float:
+    """Return the width available to the labels of a cell in points."""
+    return (PAGE_SIZES[page_size][0] - 2 * MARGIN) / columns - 2 * PADDING
+
+
+def _layout(page_size: str, columns: int, rows: int, lines: int) -> tuple[int, int, float, float, float]:
+    """Return the page width and height, cell width and height, and QR code size in points."""
+    width, height = PAGE_SIZES[page_size]
+    cell_w = (width - 2 * MARGIN) / columns
+    cell_h = (height - 2 * MARGIN) / rows
+    size = min(cell_w, cell_h - lines * LINE_HEIGHT) - 2 * PADDING
+    if size <= 0:
+        raise ValueError(f"{columns} columns and {rows} rows do not fit on a {page_size} page")
+    return width, height, cell_w, cell_h, size
+
+
+def _wrap(page: list[Card], width: float) -> list[Card]:
+    """Wrap the labels of a page to roughly fit a width in points.
+
+    Labels are split at a fixed width and never shortened, since a card is
+    useless without its exact password.
+    """
+    # Helvetica averages a little over half the font size per character
+    chars = max(int(width / (FONT_SIZE * 0.55)), 4)
+    return [
+        (qrtext, quality, [label[i:i + chars] for label in labels for i in range(0, max(len(label), 1), chars)])
+        for qrtext, quality, labels in page
+    ]
+
+
+def write_pdf(path: str, cards: Iterable[Card], page_size: str = 'a4', columns: int = 3, rows: int = 4) -> int:
+    """Write cards to a PDF, one page at a time, and return the number of pages.
+
+    Each QR code is embedded as a 1-bit image of its modules and scaled by the
+    PDF viewer, so pages stay small no matter how large they are printed.
+    """
+    cards = _nonempty(cards)
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            kids = _write_pdf(f, cards, page_size, columns, rows)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+    _LOGGER.debug("Wrote %i page QR code sheet %s", kids, path)
+    return kids
+
+
+def _write_pdf(f: io.BufferedWriter, cards: Iterable[Card], page_size: str, columns: int, rows: int) -> int:
+    """Write cards to an open PDF file and return the number of pages."""
+    pdf = _PdfWriter(f)
+    catalog, pages, font = pdf.reserve(), pdf.reserve(), pdf.reserve()
+    pdf.write(catalog, f"<< /Type /Catalog /Pages {pages} 0 R >>".encode())
+    pdf.write(font, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    kids = []
+    for page in _pages(cards, columns * rows):
+        page = _wrap(page, _cell_width(page_size, columns))
+        lines = max(len(labels) for _, _, labels in page)
+        width, height, cell_w, cell_h, size = _layout(page_size, columns, rows, lines)
+
+        images = []
+        content = []
+        for idx, (qrtext, quality, labels) in enumerate(page):
+            row, col = divmod(idx, columns)
+            x0 = MARGIN + col * cell_w
+            top = height - MARGIN - row * cell_h
+            x = x0 + (cell_w - size) / 2
+            y = top - PADDING - size
+
+            images.append(pdf.image(qr.matrix(qrtext, quality)))
+            content.append(f"q {size:.2f} 0 0 {size:.2f} {x:.2f} {y:.2f} cm /Im{idx} Do Q")
+
+            for line, label in enumerate(labels):
+                ty = y - (line + 1) * LINE_HEIGHT
+                content.append(f"BT /F1 {FONT_SIZE} Tf {x0 + PADDING:.2f} {ty:.2f} Td ({_pdf_text(label)}) Tj ET")
+
+        stream = zlib.compress('\n'.join(content).encode('latin-1'))
+        contents = pdf.reserve()
+        pdf.write(contents, f"<< /Length {len(stream)} /Filter /FlateDecode >>".encode(), stream)
+
+        xobjects = ' '.join(f"/Im{idx} {num} 0 R" for idx, num in enumerate(images))
+        kid = pdf.reserve()
+        pdf.write(kid, (
+            f"<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {width} {height}] "
+            f"/Resources << /Font << /F1 {font} 0 R >> /XObject << {xobjects} >> >> "
+            f"/Contents {contents} 0 R >>"
+        ).encode())
+        kids.append(kid)
+
+    # the page tree is written last, once every page is known
+    pdf.write(pages, f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>".encode())
+    pdf.close(catalog)
+    return len(kids)
+
+
+def write_png(path: str, cards: Iterable[Card], page_size: str = 'a4', columns: int = 3, rows: int = 4) -> list[str]:
+    """Write cards to numbered PNG pages, one page at a time, and return their paths.
+
+    path is the path of the first page without its extension. Pages left over
+    from a longer sheet of the same path are removed.
+    """
+    cards = _nonempty(cards)
+    scale = PNG_DPI / 72
+    font = ImageFont.load_default(size=round(FONT_SIZE * scale))
+
+    paths = []
+    for number, page in enumerate(_pages(cards, columns * rows), start=1):
+        page = _wrap(page, _cell_width(page_size, columns))
+        lines = max(len(labels) for _, _, labels in page)
+        width, height, cell_w, cell_h, size = _layout(page_size, columns, rows, lines)
+
+        img = Image.new('L', (round(width * scale), round(height * scale)), 255)
+        draw = ImageDraw.Draw(img)
+        for idx, (qrtext, quality, labels) in enumerate(page):
+            row, col = divmod(idx, columns)
+            x0 = MARGIN + col * cell_w
+            top = MARGIN + row * cell_h
+            x = x0 + (cell_w - size) / 2
+            y = top + PADDING
+
+            modules = qr.matrix(qrtext, quality)
+            box_size = max(int(size * scale / len(modules)), 1)
+            code = qr.image(modules, '#000000', '#ffffff', box_size)
+            # center the code, which may be slightly smaller than the cell allows
+            offset = (size * scale - code.width) / 2
+            img.paste(code, (round(x * scale + offset), round(y * scale + offset)))
+
+            for line, label in enumerate(labels):
+                ty = y + size + PADDING / 2 + line * LINE_HEIGHT
+                draw.text((round((x0 + PADDING) * scale), round(ty * scale)), label, fill=0, font=font)
+
+        page_path = f"{path}_{number}.png"
+        x = io.BytesIO()
+        img.save(x, format='PNG')
+        qr.write_file(page_path, x.getvalue())
+        paths.append(page_path)
+
+    for number in itertools.count(len(paths) + 1):
+        try:
+            os.remove(f"{path}_{number}.png")
+        except FileNotFoundError:
+            break
+        _LOGGER.debug("Removed stale QR code sheet page %s_%i.png", path, number)
+
+    _LOGGER.debug("Wrote %i QR code sheet pages to %s_*.png", len(paths), path)
+    return paths
+
+
+def _pdf_text(text: str) -> str:
+    """Escape a string for a PDF text object."""
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+class _PdfWriter:
+    """Minimal PDF writer that streams objects to a file as they are created."""
+
+    def __init__(self, f: io.BufferedWriter):
+        self._f = f
+        self._offsets: dict[int, int] = {}
+        self._next = 1
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def reserve(self) -> int:
+        """Reserve an object number."""
+        num = self._next
+        self._next += 1
+        return num
+
+    def write(self, num: int, obj: bytes, stream: bytes | None = None) -> None:
+        """Write an object, optionally followed by its stream."""
+        self._offsets[num] = self._f.tell()
+        self._f.write(f"{num} 0 obj\n".encode() + obj)
+        if stream is not None:
+            self._f.write(b"\nstream\n" + stream + b"\nendstream")
+        self._f.write(b"\nendobj\n")
+
+    def image(self, modules: list[list[bool]]) -> int:
+        """Write a QR code module matrix as a 1-bit grayscale image and return its object number."""
+        size = len(modules)
+        data = bytearray()
+        for row in modules:
+            # dark modules are 0 (black) in DeviceGray; rows are padded to whole bytes
+            bits = ''.join('0' if v else '1' for v in row).ljust((size + 7) // 8 * 8, '1')
+            data += int(bits, 2).to_bytes(len(bits) // 8, 'big')
+        stream = zlib.compress(bytes(data))
+        num = self.reserve()
+        self.write(num, (
+            f"<< /Type /XObject /Subtype /Image /Width {size} /Height {size} /ColorSpace /DeviceGray "
+            f"/BitsPerComponent 1 /Interpolate false /Filter /FlateDecode /Length {len(stream)} >>"
+        ).encode(), stream)
+        return num
+
+    def close(self, root: int) -> None:
+        """Write the cross-reference table and trailer."""
+        xref = self._f.tell()
+        self._f.write(f"xref\n0 {self._next}\n0000000000 65535 f \n".encode())
+        for num in range(1, self._next):
+            self._f.write(f"{self._offsets[num]:010d} 00000 n \n".encode())
+        self._f.write(f"trailer\n<< /Size {self._next} /Root {root} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
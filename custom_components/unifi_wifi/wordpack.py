@@ -0,0 +1,160 @@
+"""Custom wordlist packs for random passwords.
+
+A pack is a text file named {name}.txt in the wordlists directory, holding one
+word per line. On first use it is compiled to a binary file in the compiled
+directory, which is memory-mapped instead of being parsed again:
+
+    header   magic, version, source mtime and size, word count, bucket count
+    buckets  (word length, index of the first word, byte offset of the first word)
+    words    ASCII bytes of every word, ordered by length and without separators
+
+Every word of a bucket has the same length, so a word is found from its
+bucket's offset alone and the words within any range of lengths are a
+consecutive run. Nothing is read until a pack is used.
+"""
+
+from __future__ import annotations
+
+import logging, bisect, functools, mmap, os, struct, threading
+
+from collections.abc import Sequence
+
+from . import qr
+from .password import MAX_PASSWORD_LENGTH, WordIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b'UWWL'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHxxqqII')
+_BUCKET = struct.Struct('<III')
+
+# a word longer than the longest possible password is useless
+MAX_WORD_LENGTH = MAX_PASSWORD_LENGTH
+
+# packs are compiled by executor jobs, one at a time
+_COMPILE_LOCK = threading.Lock()
+
+
+class PackedWords(Sequence):
+    """Words of a compiled pack, read from a memory map as they are used."""
+
+    __slots__ = ('_map', '_count', '_firsts', '_buckets')
+
+    def __init__(self, data: mmap.mmap, count: int, buckets: list[tuple[int, int, int]]):
+        """Initialize the words."""
+        self._map = data
+        self._count = count
+        self._firsts = [first for _, first, _ in buckets]
+        self._buckets = buckets
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('word index out of range')
+        length, first, offset = self._buckets[bisect.bisect_right(self._firsts, i) - 1]
+        start = offset + (i - first) * length
+        return self._map[start:start + length].decode('ascii')
+
+
+def validate(words: list[str], path: str) -> list[str]:
+    """Return the unique words of a pack ordered by length, or raise ValueError for an invalid word."""
+    for line, word in enumerate(words, start=1):
+        if not word:
+            continue
+        # passwords must be ASCII, which the services would otherwise only find out when writing to the controller
+        if not (word.isascii() and word.isprintable()):
+            raise ValueError(f"Wordlist {path} line {line} is not a printable ASCII word: {word!r}")
+        if len(word) > MAX_WORD_LENGTH:
+            raise ValueError(f"Wordlist {path} line {line} is longer than {MAX_WORD_LENGTH} characters")
+
+    unique = sorted({w for w in words if w}, key=lambda w: (len(w), w))
+    if not unique:
+        raise ValueError(f"Wordlist {path} has no words")
+    return unique
+
+
+def compile_pack(source: str, target: str) -> None:
+    """Compile the text wordlist source to the binary pack target."""
+    with open(source, encoding='utf-8') as f:
+        words = validate([line.strip() for line in f], source)
+    stat = os.stat(source)
+
+    buckets = []
+    offset = 0
+    for i, word in enumerate(words):
+        if not buckets or buckets[-1][0] != len(word):
+            buckets.append((len(word), i, offset))
+        offset += len(word)
+
+    data = bytearray(_HEADER.pack(MAGIC, VERSION, stat.st_mtime_ns, stat.st_size, len(words), len(buckets)))
+    for bucket in buckets:
+        data += _BUCKET.pack(*bucket)
+    base = len(data)
+    # bucket offsets are relative to the start of the words
+    data += ''.join(words).encode('ascii')
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    qr.write_file(target, bytes(data))
+    _LOGGER.debug("Compiled wordlist %s with %i words in %i length buckets (%i bytes of words)", source, len(words), len(buckets), len(data) - base)
+
+
+def _map(target: str, mtime_ns: int, size: int) -> WordIndex | None:
+    """Memory-map a compiled pack, or return None if it is missing or stale."""
+    try:
+        with open(target, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, version, source_mtime_ns, source_size, count, nbuckets = _HEADER.unpack_from(data)
+    except struct.error:
+        magic = None
+    if magic != MAGIC or version != VERSION or source_mtime_ns != mtime_ns or source_size != size:
+        data.close()
+        return None
+
+    base = _HEADER.size + nbuckets * _BUCKET.size
+    buckets = [
+        (length, first, base + offset)
+        for length, first, offset in _BUCKET.iter_unpack(data[_HEADER.size:base])
+    ]
+
+    # bounds[n] is the position of the first word longer than n - 1 characters
+    longest = buckets[-1][0]
+    bounds = []
+    for n in range(longest + 2):
+        bounds.append(next((first for length, first, _ in buckets if length >= n), count))
+    return WordIndex(PackedWords(data, count, buckets), tuple(bounds))
+
+
+@functools.lru_cache(maxsize=16)
+def _load(source: str, target: str, mtime_ns: int, size: int) -> WordIndex:
+    """Load a pack, compiling it first if needed. Cached per version of the source file."""
+    with _COMPILE_LOCK:
+        if (index := _map(target, mtime_ns, size)) is None:
+            compile_pack(source, target)
+            index = _map(target, mtime_ns, size)
+    if index is None:
+        # the source changed while it was compiled, so it is compiled again on the next use
+        raise ValueError(f"Wordlist {source} changed while it was compiled")
+    return index
+
+
+def load(directory: str, compiled: str, name: str) -> WordIndex:
+    """Return the word index of the pack name in directory, compiled into the compiled directory.
+
+    Raises FileNotFoundError if there is no such pack and ValueError if it is
+    invalid. Call this from the executor.
+    """
+    source = os.path.join(directory, f"{name}.txt")
+    stat = os.stat(source)
+    return _load(source, os.path.join(compiled, f"{name}.bin"), stat.st_mtime_ns, stat.st_size)
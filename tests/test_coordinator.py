@@ -0,0 +1,56 @@
+"""Tests of the UniFi coordinator."""
+
+from __future__ import annotations
+
+import asyncio, os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.unifi_wifi import CONFIG_SCHEMA  # noqa: E402
+from custom_components.unifi_wifi.const import DOMAIN  # noqa: E402
+from custom_components.unifi_wifi.coordinator import (  # noqa: E402
+    ADAPTIVE_MAX_FACTOR,
+    POLL_JITTER,
+    UnifiWifiCoordinator
+)
+
+
+def _coordinator(hass: HomeAssistant, **options) -> UnifiWifiCoordinator:
+    config = CONFIG_SCHEMA({DOMAIN: [{
+        'name': 'test',
+        'host': 'controller.invalid',
+        'username': 'user',
+        'password': 'pass',
+        **options
+    }]})
+    return UnifiWifiCoordinator(hass, config[DOMAIN][0])
+
+
+def test_adaptive_backoff_is_capped(tmp_path):
+    """Stable polls back off to ADAPTIVE_MAX_FACTOR times scan_interval and stay there."""
+
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        coordinator = _coordinator(hass, adaptive_polling=True)
+        base = coordinator._scan_interval.total_seconds()
+
+        # more stable polls than 2 ** n can take as a float exponent
+        for _ in range(2000):
+            interval = coordinator._next_interval(False)
+
+        assert coordinator.effective_interval == round(base * ADAPTIVE_MAX_FACTOR)
+        seconds = interval.total_seconds()
+        assert base * ADAPTIVE_MAX_FACTOR * (1 - POLL_JITTER) <= seconds <= base * ADAPTIVE_MAX_FACTOR * (1 + POLL_JITTER)
+
+        # a change drops back to fast polling, and the backoff starts over afterwards
+        coordinator._next_interval(True)
+        assert coordinator.effective_interval < base
+        coordinator._fast_until = 0
+        coordinator._next_interval(False)
+        assert coordinator.effective_interval == round(base)
+
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())